@@ -1,5 +1,5 @@
 # constants.py
-KNOWN_ITEMS = {
+KNOWN_ITEMS = frozenset({
     "rice", "wheat", "sugar", "oil", "dal", "flour",
     "salt", "atta", "maida", "sooji", "poha", "tea",
     "coffee", "milk", "ghee", "butter", "bread", "ragi",
@@ -8,7 +8,7 @@ KNOWN_ITEMS = {
     "onion", "potato", "tomato", "garlic", "ginger",
     "carrot", "cabbage", "brinjal", "spinach", "peas",
     "lemon", "coconut", "groundnut", "soya", "corn",
-}
+})
 
 UNIT_CANONICAL = {
     "kg": "kg", "kilo": "kg", "kilos": "kg",
@@ -30,9 +30,9 @@ UNIT_CANONICAL = {
     "sack": "bag", "sacks": "bag",
 }
 
-KNOWN_UNITS = set(UNIT_CANONICAL.keys())
+KNOWN_UNITS = frozenset(UNIT_CANONICAL.keys())
 
-STOP_WORDS = {
+STOP_WORDS = frozenset({
     "add", "put", "want", "i", "need", "of", "the", "a", "an",
     "please", "some", "more", "to", "and", "give", "me", "get",
     "would", "like", "could", "can", "also", "another", "few",
@@ -47,48 +47,51 @@ STOP_WORDS = {
     "everything", "anything", "wrong", "reply", "properly",
     "what", "how", "when", "where", "why", "who", "which",
     "up", "down", "out", "off", "over", "under", "back",
-}
+})
 
-AFFIRM_WORDS = {
+AFFIRM_WORDS = frozenset({
     "yes", "yeah", "yep", "yup", "correct", "right",
     "ok", "okay", "sure", "confirm", "absolutely", "definitely",
     "fine", "agreed", "proceed", "haan", "bilkul",
-}
+})
 
-DENY_WORDS = {
+DENY_WORDS = frozenset({
     "no", "nope", "nah", "cancel", "wrong", "incorrect",
     "dont", "not", "stop", "wait", "hold",
     "different", "mistake", "error", "nahi",
-}
+})
 
-ACCUMULATE_WORDS = {
+ACCUMULATE_WORDS = frozenset({
     "more", "extra", "additional", "another", "again",
-}
+})
 
-EXIT_WORDS = {
+EXIT_WORDS = frozenset({
     "bye", "goodbye", "exit", "quit",
     "finish", "thats all", "nothing else", "done",
-}
+})
 
-SHOW_CART_WORDS = {
+SHOW_CART_WORDS = frozenset({
     "show", "cart", "list", "display",
     "review", "summary",
-}
+})
 
-CONFIRM_ORDER_WORDS = {
+CONFIRM_ORDER_WORDS = frozenset({
     "confirm", "place", "finalize", "submit", "complete",
-}
+})
 
-UPDATE_WORDS = {
+UPDATE_WORDS = frozenset({
     "change", "update", "modify", "replace", "correct",
     "edit", "fix", "set",
-}
+})
 
-REMOVE_WORDS = {
+REMOVE_WORDS = frozenset({
     "remove", "delete", "drop",
-}
+})
 
 MAX_CART_ITEMS            = 20
 MAX_ITEM_QUANTITY         = 9999
 MAX_TURNS_PER_SESSION     = 100
-MAX_LLM_CALLS_PER_SESSION = 50
\ No newline at end of file
+MAX_LLM_CALLS_PER_SESSION = 50
+SESSION_CACHE_MAX_SIZE    = 1000   # sessions kept in-process per MemoryManager
+SESSION_CACHE_TTL_S       = 300    # idle seconds before a session is evicted
+MAX_CALL_DURATION_S       = 3600   # room tasks older than this are cancelled
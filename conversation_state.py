@@ -3,26 +3,30 @@
 # This is the ONLY object passed between modules.
 # All mutations go through ConversationState methods only.
 
-from enum import Enum
 from dataclasses import dataclass, field
 from typing import Optional
 
 
 # ── Phases ────────────────────────────────────────────────────────────────────
+# Plain str constants rather than an Enum — phase checks run several
+# times per turn and str equality is the cheapest comparison available.
 
-class Phase(str, Enum):
-    IDLE             = "IDLE"
-    SLOT_FILLING     = "SLOT_FILLING"
-    AWAITING_CONFIRM = "AWAITING_CONFIRM"
-    CONFIRMED        = "CONFIRMED"
+PHASE_IDLE             = "IDLE"
+PHASE_SLOT_FILLING     = "SLOT_FILLING"
+PHASE_AWAITING_CONFIRM = "AWAITING_CONFIRM"
+PHASE_CONFIRMED        = "CONFIRMED"
+
+PHASES = frozenset({
+    PHASE_IDLE, PHASE_SLOT_FILLING, PHASE_AWAITING_CONFIRM, PHASE_CONFIRMED,
+})
 
 
 # Legal transitions — anything not listed here is forbidden
 _ALLOWED = {
-    Phase.IDLE:             {Phase.SLOT_FILLING, Phase.IDLE},
-    Phase.SLOT_FILLING:     {Phase.SLOT_FILLING, Phase.AWAITING_CONFIRM, Phase.IDLE},
-    Phase.AWAITING_CONFIRM: {Phase.CONFIRMED, Phase.SLOT_FILLING, Phase.IDLE},
-    Phase.CONFIRMED:        {Phase.IDLE},
+    PHASE_IDLE:             frozenset({PHASE_SLOT_FILLING, PHASE_IDLE}),
+    PHASE_SLOT_FILLING:     frozenset({PHASE_SLOT_FILLING, PHASE_AWAITING_CONFIRM, PHASE_IDLE}),
+    PHASE_AWAITING_CONFIRM: frozenset({PHASE_CONFIRMED, PHASE_SLOT_FILLING, PHASE_IDLE}),
+    PHASE_CONFIRMED:        frozenset({PHASE_IDLE}),
 }
 
 
@@ -32,7 +36,7 @@ class InvalidTransitionError(Exception):
 
 # ── Slot buffer ───────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class SlotBuffer:
     """
     Holds partial item data while slots are being filled.
@@ -43,6 +47,9 @@ class SlotBuffer:
     unit:          Optional[str]   = None
     is_accumulate: bool            = False
     is_update:     bool            = False
+    # Re-prompt counter for _ask_for_missing — declared because slots
+    # forbid ad-hoc attributes. Not persisted.
+    _ask_count:    int             = field(default=0, repr=False, compare=False)
 
     def is_complete(self) -> bool:
         return (
@@ -104,35 +111,50 @@ class SlotBuffer:
 
 # ── Conversation state ────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ConversationState:
     """
     Complete state for one call session.
     Loaded from MongoDB at session start, saved after every turn.
     """
     session_id:  str
-    phase:       Phase      = Phase.IDLE
+    phase:       str        = PHASE_IDLE
     slot_buffer: SlotBuffer = field(default_factory=SlotBuffer)
-    items:       list       = field(default_factory=list)
+    # Cart keyed by item name (insertion-ordered) for O(1) lookup/removal
+    items_by_name: dict     = field(default_factory=dict)
     history:     list       = field(default_factory=list)
     llm_calls:   int        = 0
     turn_count:  int        = 0
+    # Memoised "qty unit name, ..." string — reset whenever the cart changes
+    _cart_summary: Optional[str] = field(default=None, repr=False, compare=False)
+
+    # ── Cart ──────────────────────────────────────────────────────────────────
+
+    @property
+    def items(self) -> list:
+        """Cart as a list of item dicts, in the order they were added."""
+        return list(self.items_by_name.values())
+
+    @items.setter
+    def items(self, value: list) -> None:
+        self.items_by_name = {i["name"]: i for i in value}
+        self._cart_summary = None
 
     # ── Phase transitions ─────────────────────────────────────────────────────
 
-    def transition(self, target: Phase) -> None:
+    def transition(self, target: str) -> None:
         """
         Enforced transition. Raises InvalidTransitionError for illegal moves.
         Use this in normal execution flow.
         """
-        allowed = _ALLOWED.get(self.phase, set())
+        allowed = _ALLOWED.get(self.phase, frozenset())
         if target not in allowed:
             raise InvalidTransitionError(
-                f"Illegal transition: {self.phase.value} -> {target.value}"
+                f"Illegal transition: {self.phase} -> {target}"
             )
         self.phase = target
 
-    def force_transition(self, target: Phase) -> None:
+    def force_transition(self, target: str) -> None:
         """
         Bypasses validation. Use ONLY for error recovery.
         Never use this in normal flow.
@@ -144,7 +166,7 @@ class ConversationState:
     def to_mongo_doc(self) -> dict:
         return {
             "session_id": self.session_id,
-            "phase":      self.phase.value,
+            "phase":      self.phase,
             "slot_buffer": {
                 "name":          self.slot_buffer.name,
                 "quantity":      self.slot_buffer.quantity,
@@ -161,7 +183,9 @@ class ConversationState:
     @classmethod
     def from_mongo_doc(cls, doc: dict) -> "ConversationState":
         state = cls(session_id=doc["session_id"])
-        state.phase      = Phase(doc.get("phase", "IDLE"))
+        state.phase      = doc.get("phase", PHASE_IDLE)
+        if state.phase not in PHASES:
+            raise ValueError(f"Unknown phase in session doc: {state.phase!r}")
         state.items      = doc.get("items", [])
         state.history    = doc.get("history", [])
         state.llm_calls  = doc.get("llm_calls", 0)
@@ -179,7 +203,7 @@ class ConversationState:
     def __repr__(self):
         return (
             f"ConversationState(session={self.session_id!r}, "
-            f"phase={self.phase.value}, "
-            f"items={len(self.items)}, "
+            f"phase={self.phase}, "
+            f"items={len(self.items_by_name)}, "
             f"buffer={self.slot_buffer})"
         )
@@ -9,18 +9,20 @@
 
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 
 from constants import (
     UNIT_CANONICAL, KNOWN_UNITS, KNOWN_ITEMS,
     STOP_WORDS, ACCUMULATE_WORDS,
+    AFFIRM_WORDS, DENY_WORDS, EXIT_WORDS, SHOW_CART_WORDS,
     MAX_ITEM_QUANTITY,
 )
 
 
 # ── Result type ───────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class ParseResult:
     name:          Optional[str]   = None
     quantity:      Optional[float] = None
@@ -59,11 +61,28 @@ class ParseResult:
 def parse_item(raw_text: str) -> ParseResult:
     """
     Main parser. Always returns a ParseResult. Never raises.
+    Results are memoized — callers get a fresh ParseResult each time.
     """
     if not raw_text or not raw_text.strip():
         return ParseResult()
 
-    text = _normalize(raw_text)
+    key = raw_text.strip().lower()
+    if key in _TRIVIAL_INPUTS:
+        return ParseResult()
+
+    return ParseResult(*_parse_item_cached(key))
+
+
+@lru_cache(maxsize=4096)
+def _parse_item_cached(key: str) -> tuple:
+    # Keyed on strip().lower() — the parse only ever sees that form,
+    # so it is identical for every input mapping to this key.
+    r = _parse_uncached(key)
+    return (r.name, r.quantity, r.unit, r.is_accumulate, r.is_update, r.confidence)
+
+
+def _parse_uncached(key: str) -> ParseResult:
+    text = _normalize(key)
     result = ParseResult()
 
     # Intent flags
@@ -105,20 +124,32 @@ def parse_item(raw_text: str) -> ParseResult:
     return result
 
 
+def parse_items_batch(texts: list) -> list:
+    """
+    Batch entry point for offline replay / regression evals.
+    Repeated texts are served from parse_item's cache.
+    """
+    return [parse_item(text) for text in texts]
+
+
 # ── Normalizer ────────────────────────────────────────────────────────────────
 
-def _normalize(text: str) -> str:
-    text = text.lower().strip()
-    text = re.sub(r'\s+', ' ', text)
+_NUMBER_WORDS = {
+    "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
+    "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10",
+    "half": "0.5", "quarter": "0.25",
+}
 
-    number_words = {
-        "one": "1", "two": "2", "three": "3", "four": "4", "five": "5",
-        "six": "6", "seven": "7", "eight": "8", "nine": "9", "ten": "10",
-        "half": "0.5", "quarter": "0.25",
-    }
-    for word, digit in number_words.items():
-        text = re.sub(rf'\b{word}\b', digit, text)
+# One pass over the text instead of one re.sub per number word
+_NUMWORD_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _NUMBER_WORDS)) + r')\b')
+_WS_RE      = re.compile(r'\s+')
 
+
+def _normalize(text: str) -> str:
+    # Input is the cache key from parse_item — already lower()ed and
+    # strip()ped, so only whitespace runs and number words remain.
+    text = _WS_RE.sub(' ', text)
+    text = _NUMWORD_RE.sub(lambda m: _NUMBER_WORDS[m.group(1)], text)
     return text
 
 
@@ -129,17 +160,57 @@ def _detect_accumulate(text: str) -> bool:
     return bool(tokens & ACCUMULATE_WORDS)
 
 
+_UPDATE_TRIGGERS = frozenset({"change", "update", "modify", "replace", "set", "correct", "edit"})
+
+# Whole-utterance affirm/deny/exit/show-cart replies carry no item data, so
+# parse_item returns an empty result for them without running the pipeline.
+# Words that set an intent flag ("correct" → is_update) still go through it.
+_TRIVIAL_INPUTS = (
+    (AFFIRM_WORDS | DENY_WORDS | EXIT_WORDS | SHOW_CART_WORDS)
+    - _UPDATE_TRIGGERS - ACCUMULATE_WORDS
+)
+
+
 def _detect_update(text: str) -> bool:
-    update_triggers = {"change", "update", "modify", "replace", "set", "correct", "edit"}
     tokens = set(text.split())
-    return bool(tokens & update_triggers)
+    return bool(tokens & _UPDATE_TRIGGERS)
 
 
 # ── Tier 1: Regex pattern matching ───────────────────────────────────────────
 
-_UNIT_PATTERN = "|".join(
-    sorted(KNOWN_UNITS, key=len, reverse=True)
-)
+def _trie_pattern(words) -> str:
+    """
+    Builds a prefix-factored alternation from a word set, e.g.
+    {"kg", "kilo", "kilos"} -> "k(?:ilos?|g)". The engine commits to one
+    branch per character instead of retrying every word at each position.
+    Longer continuations are tried before a word ends, so matching still
+    prefers the longest unit — same as the old longest-first alternation.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = None  # end-of-word marker
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if len(branches) == 1:
+            body    = branches[0]
+            grouped = len(body) == 1
+        else:
+            body    = "(?:" + "|".join(branches) + ")"
+            grouped = True
+        if "" not in node:
+            return body
+        return body + "?" if grouped else "(?:" + body + ")?"
+
+    return "(?:" + build(trie) + ")"
+
+
+_UNIT_PATTERN = _trie_pattern(KNOWN_UNITS)
 
 _PATTERNS = [
     # "5 kg rice" | "5kg rice" | "5 kilograms of rice"
@@ -152,10 +223,22 @@ _PATTERNS = [
     rf'(?P<n>[a-z]+)\s+(?P<qty>\d+(?:\.\d+)?)\b',
 ]
 
+# google-re2 gives linear-time DFA matching for the large unit alternation.
+# Optional — falls back to the stdlib engine when it isn't installed.
+try:
+    import re2 as _regex_engine
+except ImportError:
+    _regex_engine = re
+
+# Compiled once at import — _tier1 runs on every user turn.
+# Kept as an ordered list (not one fused alternation) because pattern
+# priority matters: the first pattern that matches anywhere wins.
+_COMPILED_PATTERNS = [_regex_engine.compile(p) for p in _PATTERNS]
+
 
 def _tier1(text: str, result: ParseResult) -> ParseResult:
-    for pattern in _PATTERNS:
-        m = re.search(pattern, text)
+    for pattern in _COMPILED_PATTERNS:
+        m = pattern.search(text)
         if not m:
             continue
 
@@ -182,42 +265,50 @@ def _tier1(text: str, result: ParseResult) -> ParseResult:
 # ── Tier 2: Token scanning ────────────────────────────────────────────────────
 
 def _tier2(text: str, result: ParseResult) -> ParseResult:
-    tokens = text.split()
+    # Hot globals bound to locals — this loop runs once per token
+    unit_map = UNIT_CANONICAL
+    invalid  = _INVALID_NAMES
 
-    for token in tokens:
+    name, quantity, unit = result.name, result.quantity, result.unit
 
-        if result.quantity is None:
+    for token in text.split():
+        if name is not None and quantity is not None and unit is not None:
+            break
+
+        # Only numeric-looking tokens pay for float() and its exception path
+        if quantity is None and (token[0].isdigit() or token[0] in ".-+"):
             try:
-                val = float(token)
-                result.quantity = val
+                quantity = float(token)
                 continue
             except ValueError:
                 pass
 
-        if result.unit is None and token in UNIT_CANONICAL:
-            result.unit = UNIT_CANONICAL[token]
+        if unit is None and token in unit_map:
+            unit = unit_map[token]
             continue
 
-        if result.name is None and _is_valid_name(token):
-            result.name = token
+        # Inlined _is_valid_name, cheapest checks first
+        if (
+            name is None
+            and len(token) >= 3
+            and token.isalpha()
+            and token not in invalid
+        ):
+            name = token
 
+    result.name, result.quantity, result.unit = name, quantity, unit
     return result
 
 
 # ── Name validator ────────────────────────────────────────────────────────────
 
+# Everything that can never be an item name, checked in one lookup.
+# "nan"/"inf"/"infinity" are alphabetic but float() accepts them.
+_INVALID_NAMES = STOP_WORDS | KNOWN_UNITS | frozenset({"nan", "inf", "infinity"})
+
+
 def _is_valid_name(word: str) -> bool:
-    if not word or len(word) < 3:
-        return False
-    if word in STOP_WORDS:
-        return False
-    if word in UNIT_CANONICAL:
-        return False
-    try:
-        float(word)
-        return False
-    except ValueError:
-        pass
-    if not word.isalpha():
+    # isalpha() rules out every numeric string except the three above
+    if len(word) < 3 or not word.isalpha():
         return False
-    return True
+    return word not in _INVALID_NAMES
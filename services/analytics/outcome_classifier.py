@@ -3,10 +3,12 @@
 
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
-from shared.events.event_bus import consume, publish, OutcomeClassifiedEvent
-from shared.database.mongo_client import get_db
+from shared.events.event_bus import consume, publish_async, event_isoformat, BaseEvent, OutcomeClassifiedEvent
+from shared.database.bulk_writer import BulkWriter
 
 # Retry rules based on call outcome
 RETRY_RULES = {
@@ -18,18 +20,20 @@ RETRY_RULES = {
     "user_hung_up":    {"retry": True,  "delay_hours": 6},
 }
 
+# Bursts of call-end events are written in batches, off the consumer loop
+_outcomes_writer = BulkWriter("call_outcomes")
 
-def classify_and_emit(event_data: dict) -> None:
-    call_id    = event_data.get("call_id")
-    session_id = event_data.get("session_id")
-    payload    = event_data.get("payload", {})
+
+def classify_and_emit(event: BaseEvent) -> None:
+    call_id    = event.call_id
+    session_id = event.session_id
+    payload    = event.payload
     outcome    = payload.get("outcome", "unknown")
     
     rule = RETRY_RULES.get(outcome, {"retry": False, "delay_hours": 0})
     
     print(f"[OutcomeClassifier] Call {call_id}: {outcome} → retry={rule['retry']}")
     
-    db = get_db()
     classification = {
         "call_id":              call_id,
         "session_id":           session_id,
@@ -38,16 +42,13 @@ def classify_and_emit(event_data: dict) -> None:
         "retry_delay_hours":    rule["delay_hours"],
         "turn_count":           payload.get("turn_count", 0),
         "items_count":          payload.get("items_count", 0),
-        "classified_at":        event_data.get("timestamp"),
+        "classified_at":        event_isoformat(event),
     }
     
-    try:
-        db.call_outcomes.insert_one(classification)
-        print(f"[OutcomeClassifier] Saved classification to MongoDB")
-    except Exception as e:
-        print(f"[OutcomeClassifier] MongoDB error: {e}")
+    _outcomes_writer.insert(classification)
+    print(f"[OutcomeClassifier] Queued classification for MongoDB")
     
-    publish(OutcomeClassifiedEvent(
+    publish_async(OutcomeClassifiedEvent(
         call_id=call_id,
         session_id=session_id,
         payload={
@@ -4,30 +4,51 @@
 
 import sys
 import os
+import asyncio
 from pathlib import Path
 
-# Path setup
-sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "voice_agent"))
-sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "voice_agent" / "llm"))
+_ROOT = Path(__file__).resolve().parents[2]
+_VA   = _ROOT / "services" / "voice_agent"
 
+# Path setup — guarded so reloads/re-imports don't keep prepending
+for p in [str(_ROOT), str(_VA), str(_VA / "llm")]:
+    if p not in sys.path:
+        sys.path.insert(0, p)
+
+import redis as redis_lib
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from datetime import datetime
 from dotenv import load_dotenv
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
-
 from memory_manager import MemoryManager
 from decision_engine import decide
-from action_executor import execute
+from action_executor import execute, collect_response
 from conversation_state import ConversationState
+from shared.database.mongo_client import get_db, get_async_db
+
+try:
+    from groq import Groq
+except ImportError:
+    Groq = None
+
+# Filled in once by load_config() at startup, not at import — importing
+# this module (tests, reload, worker fork) doesn't touch .env or clients.
+REDIS_URL    = "redis://localhost:6379"
+GROQ_API_KEY = None
+
+_db           = None
+_adb          = None
+_redis_client = None
 
 app = FastAPI(
     title="Ration Ordering Agent API",
     description="REST API for the AI calling agent",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson encodes datetimes natively, so Mongo docs are returned as-is
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -62,6 +83,31 @@ class SessionResponse(BaseModel):
     history: list
 
 
+# ── Startup ───────────────────────────────────────────────────────────────────
+
+@app.on_event("startup")
+def load_config():
+    # Env doesn't change during the process lifetime — read once
+    global REDIS_URL, GROQ_API_KEY, _db, _adb, _redis_client
+    load_dotenv(dotenv_path=_ROOT / ".env")
+    REDIS_URL    = os.getenv("REDIS_URL", REDIS_URL)
+    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+    # All clients connect lazily, so creating them never blocks startup
+    _db           = get_db()
+    _adb          = get_async_db()
+    _redis_client = redis_lib.from_url(REDIS_URL)
+
+
+@app.on_event("startup")
+async def ensure_indexes():
+    # /orders sorts by created_at desc — serve it from index order
+    try:
+        await _adb.orders.create_index([("created_at", -1)])
+    except Exception as e:
+        print(f"[API] WARNING: Could not create indexes: {e}")
+
+
 # ── Endpoints ─────────────────────────────────────────────────────────────────
 
 @app.get("/")
@@ -75,37 +121,30 @@ def health():
 
     # MongoDB
     try:
-        from shared.database.mongo_client import get_db
-        db = get_db()
-        db.command("ping")
+        _db.command("ping")
         checks["mongodb"] = "ok"
     except Exception as e:
         checks["mongodb"] = f"error: {e}"
 
     # Redis
     try:
-        import redis as redis_lib
-        from dotenv import load_dotenv
-        import os
-        r = redis_lib.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
-        r.ping()
+        _redis_client.ping()
         checks["redis"] = "ok"
     except Exception as e:
         checks["redis"] = f"error: {e}"
 
     # Groq
-    try:
-        from groq import Groq
-        checks["groq"] = "configured" if os.getenv("GROQ_API_KEY") else "missing key"
-    except Exception:
+    if Groq is None:
         checks["groq"] = "not installed"
+    else:
+        checks["groq"] = "configured" if GROQ_API_KEY else "missing key"
 
     all_ok = all(v == "ok" or v == "configured" for v in checks.values())
     return {"status": "healthy" if all_ok else "degraded", "checks": checks}
 
 
 @app.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest):
     """
     Send a message to the agent and get a response.
     Creates a new session if session_id doesn't exist.
@@ -113,11 +152,13 @@ def chat(req: ChatRequest):
     if not req.message or not req.message.strip():
         raise HTTPException(status_code=400, detail="Message cannot be empty")
 
-    state = memory.get_session(req.session_id)
+    # Session I/O and the intent classifier (which may make a blocking
+    # LLM call) stay off the event loop; execute() is natively async.
+    state = await asyncio.to_thread(memory.get_session, req.session_id)
 
-    intent_result = decide(req.message, state)
-    response      = execute(intent_result, state)
-    memory.save_session(state)
+    intent_result = await asyncio.to_thread(decide, req.message, state)
+    response      = await collect_response(await execute(intent_result, state))
+    await asyncio.to_thread(memory.save_session, state)
 
     if response == "__EXIT__":
         response = "Thank you for your order. Goodbye!"
@@ -125,7 +166,7 @@ def chat(req: ChatRequest):
     return ChatResponse(
         session_id=req.session_id,
         response=response,
-        phase=state.phase.value,
+        phase=state.phase,
         cart=state.items,
         turn_count=state.turn_count,
     )
@@ -137,7 +178,7 @@ def get_session(session_id: str):
     state = memory.get_session(session_id)
     return SessionResponse(
         session_id=session_id,
-        phase=state.phase.value,
+        phase=state.phase,
         cart=state.items,
         turn_count=state.turn_count,
         llm_calls=state.llm_calls,
@@ -149,42 +190,34 @@ def get_session(session_id: str):
 def reset_session(session_id: str):
     """Reset a session to fresh state."""
     state = ConversationState(session_id=session_id)
-    memory._cache[session_id] = state
     memory.save_session(state)
     return {"status": "reset", "session_id": session_id}
 
 
 @app.get("/orders")
-def get_orders(limit: int = 20):
+async def get_orders(limit: int = 20):
     """Get recent confirmed orders from MongoDB."""
     try:
-        from shared.database.mongo_client import get_db
-        db     = get_db()
-        orders = list(
-            db.orders.find({}, {"_id": 0})
+        # batch_size=limit fetches the whole page in one round-trip
+        orders = await (
+            _adb.orders.find({}, {"_id": 0})
             .sort("created_at", -1)
             .limit(limit)
+            .batch_size(limit)
+            .to_list()
         )
-        # Convert datetime to string for JSON
-        for o in orders:
-            if "created_at" in o:
-                o["created_at"] = o["created_at"].isoformat()
         return {"orders": orders, "count": len(orders)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/orders/{order_id}")
-def get_order(order_id: str):
+async def get_order(order_id: str):
     """Get a specific order by ID."""
     try:
-        from shared.database.mongo_client import get_db
-        db    = get_db()
-        order = db.orders.find_one({"order_id": order_id}, {"_id": 0})
+        order = await _adb.orders.find_one({"order_id": order_id}, {"_id": 0})
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
-        if "created_at" in order:
-            order["created_at"] = order["created_at"].isoformat()
         return order
     except HTTPException:
         raise
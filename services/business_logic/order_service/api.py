@@ -1,15 +1,102 @@
+import asyncio
 from fastapi import FastAPI
 from pydantic import BaseModel
-from shared.database.mongo_client import db
+from pymongo import InsertOne
+from shared.database.bulk_writer import write_with_retry
+from shared.database.mongo_client import get_db
+from shared.logging.logger import get_logger
+
+logger = get_logger("order_service")
 
 app = FastAPI()
 
+# Writes are taken off the request path: handlers enqueue, a background
+# task drains the queue into insert_many batches.
+ORDER_BATCH_SIZE     = 100
+ORDER_FLUSH_INTERVAL = 0.25   # seconds
+ORDER_QUEUE_MAXSIZE  = 10_000  # bounded — put() applies backpressure when full
+
+_order_queue: asyncio.Queue = None
+_writer_task: asyncio.Task  = None
+
+
 class Order(BaseModel):
     customer_id: str
     item: str
     quantity: int
 
+
+def _write_orders(db, batch: list) -> None:
+    # Blocking. Callers were already told "queued", so a transient Mongo
+    # error is retried rather than dropping the batch; losses are logged
+    write_with_retry(db, "orders", [InsertOne(order) for order in batch])
+
+
+async def _insert_batch(db, batch: list) -> None:
+    # The write runs in a worker thread that can't be interrupted, so on
+    # cancellation wait for it to land instead of abandoning it mid-write
+    write = asyncio.ensure_future(asyncio.to_thread(_write_orders, db, batch))
+    try:
+        await asyncio.shield(write)
+    except asyncio.CancelledError:
+        await write
+        raise
+
+
+async def _order_writer():
+    db    = get_db()
+    batch = []
+    try:
+        while True:
+            batch    = [await _order_queue.get()]
+            deadline = asyncio.get_running_loop().time() + ORDER_FLUSH_INTERVAL
+            while len(batch) < ORDER_BATCH_SIZE:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(_order_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await _insert_batch(db, batch)
+            except asyncio.CancelledError:
+                batch = []   # the in-flight write was allowed to finish
+                raise
+            batch = []
+    except asyncio.CancelledError:
+        # Cancelled while collecting — these orders are already off the
+        # queue and the clients were told "queued", so write them now
+        if batch:
+            await asyncio.to_thread(_write_orders, db, batch)
+        raise
+
+
+@app.on_event("startup")
+async def _start_order_writer():
+    global _order_queue, _writer_task
+    _order_queue = asyncio.Queue(maxsize=ORDER_QUEUE_MAXSIZE)
+    _writer_task = asyncio.create_task(_order_writer())
+
+
+@app.on_event("shutdown")
+async def _stop_order_writer():
+    if _writer_task:
+        _writer_task.cancel()
+        # Let the writer finish its partial / in-flight batch first
+        await asyncio.gather(_writer_task, return_exceptions=True)
+    # Flush whatever is still queued so accepted orders aren't dropped
+    pending = []
+    while _order_queue is not None and not _order_queue.empty():
+        pending.append(_order_queue.get_nowait())
+    if pending:
+        try:
+            await asyncio.to_thread(_write_orders, get_db(), pending)
+        except Exception as e:
+            logger.error(f"[OrderService] Shutdown flush failed ({len(pending)} orders): {e}")
+
+
 @app.post("/order/update")
-def update_order(order: Order):
-    db.orders.insert_one(order.dict())
-    return {"status": "saved"}
+async def update_order(order: Order):
+    await _order_queue.put(order.dict())
+    return {"status": "queued"}
@@ -4,19 +4,25 @@
 import sys
 import os
 from datetime import datetime, timedelta
+from pymongo import ReturnDocument
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
-from shared.events.event_bus import consume, publish, CallScheduledEvent
+from shared.events.event_bus import consume, publish, BaseEvent, CallScheduledEvent
 from shared.database.mongo_client import get_db
+from shared.database.bulk_writer import BulkWriter
 
 MAX_RETRY_ATTEMPTS = 3
 
+_retry_writer = BulkWriter("retry_queue")
 
-def handle_retry(event_data: dict) -> None:
-    call_id    = event_data.get("call_id")
-    session_id = event_data.get("session_id")
-    payload    = event_data.get("payload", {})
+
+def handle_retry(event: BaseEvent) -> None:
+    call_id    = event.call_id
+    session_id = event.session_id
+    payload    = event.payload
     
     retry_recommended = payload.get("retry_recommended", False)
     retry_delay_hours = payload.get("retry_delay_hours", 0)
@@ -27,19 +33,21 @@ def handle_retry(event_data: dict) -> None:
     
     db = get_db()
     try:
-        session_doc = db.sessions.find_one({"session_id": session_id})
+        # Claim the next retry slot atomically — one round-trip, no
+        # read-modify-write race between concurrent consumers
+        session_doc = db.sessions.find_one_and_update(
+            {"session_id": session_id, "retry_count": {"$not": {"$gte": MAX_RETRY_ATTEMPTS}}},
+            {"$inc": {"retry_count": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
         if not session_doc:
-            print(f"[RetryEngine] Session not found: {session_id}")
+            if db.sessions.find_one({"session_id": session_id}, {"_id": 1}):
+                print(f"[RetryEngine] Max retries reached for {session_id}")
+            else:
+                print(f"[RetryEngine] Session not found: {session_id}")
             return
         
-        retry_count = db.call_outcomes.count_documents({
-            "session_id": session_id,
-            "retry_recommended": True
-        })
-        
-        if retry_count >= MAX_RETRY_ATTEMPTS:
-            print(f"[RetryEngine] Max retries reached for {session_id}")
-            return
+        retry_count = session_doc["retry_count"] - 1
         
         retry_time = datetime.utcnow() + timedelta(hours=retry_delay_hours)
         
@@ -52,7 +60,7 @@ def handle_retry(event_data: dict) -> None:
             "created_at":       datetime.utcnow(),
         }
         
-        db.retry_queue.insert_one(retry_doc)
+        _retry_writer.insert(retry_doc)
         
         print(f"[RetryEngine] Scheduled retry {retry_count + 1}/{MAX_RETRY_ATTEMPTS}")
         print(f"[RetryEngine] Retry time: {retry_time} ({retry_delay_hours}h from now)")
@@ -2,6 +2,7 @@
 import sys
 import os
 import asyncio
+import time
 import uuid
 from pathlib import Path
 
@@ -16,33 +17,63 @@ for p in [str(_root), str(_va), str(_llm), str(_bridge)]:
 
 from dotenv import load_dotenv
 load_dotenv(dotenv_path=_root / ".env")
+os.environ["_ENV_LOADED"] = "1"   # room_handler skips re-parsing .env
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from shared.logging.logger import get_logger
 from room_handler import RoomHandler
-sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
-sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "voice_agent"))
-sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "voice_agent" / "llm"))
-
-from dotenv import load_dotenv
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
-
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from shared.logging.logger import get_logger
-from room_handler import RoomHandler
+from constants import MAX_CALL_DURATION_S
 
 logger = get_logger("call_server")
 
-app = FastAPI(title="Call Server", version="1.0.0")
+app = FastAPI(title="Call Server", version="1.0.0", default_response_class=ORJSONResponse)
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
 
 handler = RoomHandler()
 active_rooms: dict = {}
 
+# Strong refs to running room tasks — the event loop only keeps weak ones,
+# so a task nobody references can be garbage-collected mid-call.
+background_tasks: set = set()
+
+
+def _on_room_done(session_id: str, task: asyncio.Task) -> None:
+    """Done-callback: forget the task and its room once the call ends."""
+    background_tasks.discard(task)
+    info = active_rooms.get(session_id)
+    if info is not None and info["task"] is task:
+        del active_rooms[session_id]
+
+
+async def _sweep_stale_rooms() -> None:
+    """
+    Cancels room tasks that outlive MAX_CALL_DURATION_S — e.g. when the SIP
+    provider never sends DELETE and the room never reports a disconnect.
+    Cancellation runs _on_room_done, which removes the entry.
+    """
+    while True:
+        await asyncio.sleep(60)
+        cutoff = time.monotonic() - MAX_CALL_DURATION_S
+        for sid, info in list(active_rooms.items()):
+            if info["started"] < cutoff:
+                logger.warning(f"[CallServer] Cancelling stale room for {sid}")
+                info["task"].cancel()
+
+
+@app.on_event("startup")
+async def start_sweeper():
+    task = asyncio.create_task(_sweep_stale_rooms())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+@app.on_event("shutdown")
+async def close_livekit_api():
+    await handler.aclose()
+
 
 class CallRequest(BaseModel):
     caller_number: str = "unknown"
@@ -51,7 +82,7 @@ class CallRequest(BaseModel):
 
 
 @app.get("/")
-def root():
+async def root():
     return {"status": "ok", "service": "call-server", "active_calls": len(active_rooms)}
 
 
@@ -71,7 +102,14 @@ async def inbound_call(req: CallRequest):
 
     # Launch agent in background
     task = asyncio.create_task(handler.handle_room(room_name, session_id))
-    active_rooms[session_id] = {"task": task, "room": room_name, "caller": req.caller_number}
+    background_tasks.add(task)
+    task.add_done_callback(lambda t: _on_room_done(session_id, t))
+    active_rooms[session_id] = {
+        "task":    task,
+        "room":    room_name,
+        "caller":  req.caller_number,
+        "started": time.monotonic(),
+    }
 
     return {
         "session_id":   session_id,
@@ -82,14 +120,14 @@ async def inbound_call(req: CallRequest):
 
 
 @app.get("/call/token")
-def get_token(room_name: str, participant: str = "user"):
+async def get_token(room_name: str, participant: str = "user"):
     """Generate a join token for any participant — useful for browser testing."""
     token = handler.generate_token(room_name, participant)
     return {"token": token, "room_name": room_name, "livekit_url": os.getenv("LIVEKIT_URL")}
 
 
 @app.get("/calls/active")
-def active_calls():
+async def active_calls():
     return {
         "count": len(active_rooms),
         "rooms": [
@@ -102,8 +140,15 @@ def active_calls():
 @app.delete("/call/{session_id}")
 async def end_call(session_id: str):
     if session_id in active_rooms:
-        active_rooms[session_id]["task"].cancel()
-        del active_rooms[session_id]
+        task = active_rooms[session_id]["task"]
+        task.cancel()
+        try:
+            await asyncio.wait_for(task, timeout=5)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            pass
+        except Exception as e:
+            logger.warning(f"[CallServer] Room task for {session_id} failed during shutdown: {e}")
+        active_rooms.pop(session_id, None)
         return {"status": "ended", "session_id": session_id}
     return {"status": "not_found"}
 
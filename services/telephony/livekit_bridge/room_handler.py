@@ -5,22 +5,31 @@
 import os
 import sys
 import asyncio
+import time
 from pathlib import Path
 from datetime import datetime
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
-sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "voice_agent"))
-sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "voice_agent" / "llm"))
+_root = Path(__file__).resolve().parents[3]
+_va   = _root / "services" / "voice_agent"
 
-from dotenv import load_dotenv
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
+for p in [str(_root), str(_va), str(_va / "llm")]:
+    if p not in sys.path:
+        sys.path.insert(0, p)
 
+if not os.environ.get("_ENV_LOADED"):
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=_root / ".env")
+    os.environ["_ENV_LOADED"] = "1"
+
+import jwt
 from livekit import rtc
-from livekit.api import LiveKitAPI, AccessToken, VideoGrants
+from livekit.api import LiveKitAPI
 from shared.logging.logger import get_logger
 
 logger = get_logger("room_handler")
 
+TOKEN_TTL_S = 6 * 3600   # same default lifetime as livekit.api.AccessToken
+
 
 class RoomHandler:
     def __init__(self):
@@ -31,13 +40,42 @@ class RoomHandler:
         if not all([self.url, self.key, self.secret]):
             raise ValueError("LIVEKIT_URL, LIVEKIT_API_KEY, LIVEKIT_API_SECRET must be set in .env")
 
+        # Signing key is fixed for the process — encode it once
+        self._signing_key = self.secret.encode()
+        self._api = None
+
+    @property
+    def api(self) -> LiveKitAPI:
+        """
+        One LiveKitAPI (and its HTTP session) shared by every room, so
+        control-plane calls reuse kept-alive connections instead of each
+        opening their own. Built on first use, inside the running loop.
+        """
+        if self._api is None:
+            self._api = LiveKitAPI(self.url, self.key, self.secret)
+        return self._api
+
+    async def aclose(self):
+        if self._api is not None:
+            await self._api.aclose()
+            self._api = None
+
     def generate_token(self, room_name: str, participant_name: str) -> str:
-        """Generate a LiveKit access token for a participant."""
-        token = AccessToken(self.key, self.secret)
-        token.with_identity(participant_name)
-        token.with_name(participant_name)
-        token.with_grants(VideoGrants(room_join=True, room=room_name))
-        return token.to_jwt()
+        """
+        Generate a LiveKit access token for a participant.
+        Signs the claims directly (HS256) with the same shape AccessToken
+        produces, without building the SDK's token/grant objects per call.
+        """
+        now = int(time.time())
+        claims = {
+            "iss":   self.key,
+            "sub":   participant_name,
+            "name":  participant_name,
+            "nbf":   now,
+            "exp":   now + TOKEN_TTL_S,
+            "video": {"roomJoin": True, "room": room_name},
+        }
+        return jwt.encode(claims, self._signing_key, algorithm="HS256")
 
     async def handle_room(self, room_name: str, session_id: str):
         """
@@ -65,9 +103,8 @@ class RoomHandler:
         controller = ConversationController(room=room, session_id=session_id)
         await controller.start()
 
-        # Keep alive until room disconnects
-        while room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
-            await asyncio.sleep(1)
+        # Keep alive until the room disconnects — woken by the event, no polling
+        await controller.wait_closed()
 
         logger.info(f"[RoomHandler] Session {session_id} ended")
 
@@ -82,4 +119,9 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+        run = uvloop.run
+    except ImportError:
+        run = asyncio.run
+    run(main())
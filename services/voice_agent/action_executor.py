@@ -1,73 +1,192 @@
 # services/voice_agent/action_executor.py
 # The ONLY place state is mutated.
 # Receives IntentResult + ConversationState, returns response string.
-# For conversational turns, delegates response generation to Groq.
+# For conversational turns, streams response generation from Groq.
 
+import asyncio
 import os
+import time
 import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import AsyncIterator, Union
 from dotenv import load_dotenv
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
-
-from conversation_state import ConversationState, Phase, SlotBuffer
+from conversation_state import (
+    ConversationState, SlotBuffer,
+    PHASE_IDLE, PHASE_SLOT_FILLING, PHASE_AWAITING_CONFIRM,
+)
 from item_parser import parse_item
-from constants import MAX_CART_ITEMS
+from constants import MAX_CART_ITEMS, MAX_TURNS_PER_SESSION
 
 
 # ── Smart conversational response via Groq ────────────────────────────────────
 
-def _groq_respond(user_text: str, state: ConversationState, context: str = "") -> str:
-    """
-    Generates a natural conversational response using Groq.
-    Used for greetings, acknowledgements, clarifications, and small talk.
-    Falls back to a simple default if Groq fails.
-    """
-    cart_summary = ", ".join(
-        f"{i['quantity']} {i['unit']} {i['name']}" for i in state.items
-    ) or "empty"
-
-    system = """You are a friendly ration ordering assistant on a phone call.
+# Kept byte-identical across calls (no interpolation) so the provider can
+# reuse the cached prefix instead of re-processing it every turn.
+_SYSTEM_PROMPT = """You are a friendly ration ordering assistant on a phone call.
 You help customers place their monthly grocery orders.
 Keep responses SHORT (1-2 sentences max), warm, and natural.
 If the customer is making small talk, respond naturally but gently guide them back to ordering.
 Never make up order details. Never confirm things the customer didn't say.
 Speak like a helpful human agent, not a robot."""
 
+_KEEPALIVE_S = 5.0    # httpx's default keep-alive expiry
+
+# Finished replies for greeting / acknowledgement turns ("ok", "hello", ...),
+# keyed by (normalised user text, context). Only those intents opt in, and only
+# with an empty cart, so a reply can never mention another caller's items or
+# answer a different question.
+_RESPONSE_CACHE: OrderedDict = OrderedDict()
+_RESPONSE_CACHE_SIZE = 2048
+
+
+@dataclass(slots=True)
+class _GroqPool:
+    client: object          # AsyncGroq
+    http:   object          # the httpx.AsyncClient under it
+    used:   float = 0.0     # monotonic time the pooled connection was last used
+
+
+# Pooled connections belong to the loop that opened them, so there is one
+# client per event loop rather than one per process
+_GROQ_POOLS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _GroqPool]" = weakref.WeakKeyDictionary()
+
+
+def _groq_pool() -> _GroqPool:
+    """
+    Lazily builds one AsyncGroq client for the running loop and reuses it,
+    so every turn shares the same keep-alive connection pool instead of
+    paying for a new client and TLS handshake.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _GROQ_POOLS.get(loop)
+    if pool is None:
+        import httpx
+        from groq import AsyncGroq
+        # .env is read on first use, not at import
+        load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env")
+        http = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+        client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=http)
+        pool   = _GROQ_POOLS[loop] = _GroqPool(client, http)
+    return pool
+
+
+async def warm_llm() -> None:
+    """
+    Gets this loop's Groq client ready while STT is still running: builds
+    it on first use and, if the pooled connection has probably expired,
+    opens a fresh one with a bare HEAD. That way the TLS handshake overlaps
+    the transcription instead of delaying the first token.
+    """
+    try:
+        pool = _groq_pool()
+        if time.monotonic() - pool.used < _KEEPALIVE_S:
+            return
+        pool.used = time.monotonic()
+        await pool.http.head(str(pool.client.base_url), timeout=2.0)
+    except Exception:
+        pass
+
+
+async def _groq_respond(user_text: str, state: ConversationState,
+                        context: str = "", cacheable: bool = False) -> AsyncIterator[str]:
+    """
+    Streams a natural conversational response from Groq, token by token,
+    so TTS can start on the first sentence before generation finishes.
+    Used for greetings, acknowledgements, clarifications, and small talk.
+    Falls back to a simple default if Groq fails before yielding anything.
+    cacheable replies are memoised while the cart is empty.
+    """
+    cache_key = None
+    if cacheable and not state.items_by_name:
+        cache_key = (" ".join(user_text.lower().split()), context)
+        cached    = _RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            _RESPONSE_CACHE.move_to_end(cache_key)
+            yield cached
+            return
+
+    cart_summary = _format_cart_inline(state) or "empty"
+
     user_prompt = f"""Customer said: "{user_text}"
 Current cart: {cart_summary}
 {f'Context: {context}' if context else ''}
 Respond naturally in 1-2 sentences."""
 
+    started = False
+    parts   = []
     try:
-        from groq import Groq
-        client   = Groq(api_key=os.getenv("GROQ_API_KEY"))
-        response = client.chat.completions.create(
+        pool      = _groq_pool()
+        pool.used = time.monotonic()
+        client    = pool.client
+        stream = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
-                {"role": "system", "content": system},
+                {"role": "system", "content": _SYSTEM_PROMPT},
                 {"role": "user",   "content": user_prompt},
             ],
             temperature=0.7,
             max_tokens=80,
+            stream=True,
+            user=state.session_id,
         )
-        return response.choices[0].message.content.strip()
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            text = chunk.choices[0].delta.content or ""
+            if not started:
+                text = text.lstrip()
+            if text:
+                started = True
+                parts.append(text)
+                yield text
+        if cache_key is not None and parts:
+            _RESPONSE_CACHE[cache_key] = "".join(parts).strip()
+            if len(_RESPONSE_CACHE) > _RESPONSE_CACHE_SIZE:
+                _RESPONSE_CACHE.popitem(last=False)
     except Exception as e:
-        return context if context else "What items would you like to order today?"
+        print(f"[Executor] Groq response failed: {e}")
+    # Nothing reached the caller — fall back as the blocking path used to
+    if not started:
+        yield context if context else "What items would you like to order today?"
+
+
+async def collect_response(response: Union[str, AsyncIterator[str]]) -> str:
+    """Joins a streamed response into one string; plain strings pass through."""
+    if isinstance(response, str):
+        return response
+    return "".join([chunk async for chunk in response]).strip()
 
 
 # ── Main entry point ──────────────────────────────────────────────────────────
 
-def execute(intent_result, state: ConversationState) -> str:
+_LIMIT_EXEMPT_INTENTS = frozenset({"user_confirmed", "user_denied", "exit"})
+
+
+async def execute(intent_result, state: ConversationState) -> Union[str, AsyncIterator[str]]:
+    """
+    Template replies come back as plain strings; LLM-backed replies come
+    back as an async iterator of text chunks (see collect_response).
+    """
     intent = intent_result.intent
     raw    = intent_result.raw_text
 
     state.turn_count += 1
 
+    # ── Session limit — the caller is cut off after this turn, so don't spend
+    # an LLM call on it; confirmations and exit still go through ──────────────
+    if state.turn_count >= MAX_TURNS_PER_SESSION and intent not in _LIMIT_EXEMPT_INTENTS:
+        return "We've reached the session limit. Please call again."
+
     # ── Confirmation phase ────────────────────────────────────────────────────
     if intent == "user_confirmed":
-        return _handle_confirmed(state)
+        return await _handle_confirmed(state)
 
     if intent == "user_denied":
         return _handle_denied(state)
@@ -91,26 +210,30 @@ def execute(intent_result, state: ConversationState) -> str:
 
     # ── Confirm full order ────────────────────────────────────────────────────
     if intent == "confirm_order":
-        if not state.items:
+        if not state.items_by_name:
             return _groq_respond(raw, state, "Their cart is empty. Ask them to add items first.")
         state.slot_buffer.clear()
         state.slot_buffer.name = "__ORDER_CONFIRM__"
-        state.force_transition(Phase.AWAITING_CONFIRM)
+        state.force_transition(PHASE_AWAITING_CONFIRM)
         return (
             f"You want to place this order?\n"
-            f"{_format_cart_inline(state)}\n"
+            # End the cart line so the prompt splits off as its own
+            # sentence — that's what the TTS phrase cache holds
+            f"{_format_cart_inline(state)}.\n"
             f"Say yes to confirm or no to cancel."
         )
 
     # ── Greeting ──────────────────────────────────────────────────────────────
     if intent == "greeting":
-        return _groq_respond(raw, state, "Greet them warmly and ask what they'd like to order.")
+        return _groq_respond(raw, state, "Greet them warmly and ask what they'd like to order.",
+                             cacheable=True)
 
     # ── Acknowledgement — smart contextual response ───────────────────────────
     if intent == "acknowledgement":
-        cart_count = len(state.items)
+        cart_count = len(state.items_by_name)
         if cart_count == 0:
-            return _groq_respond(raw, state, "They acknowledged. Invite them to start ordering.")
+            return _groq_respond(raw, state, "They acknowledged. Invite them to start ordering.",
+                                 cacheable=True)
         return _groq_respond(
             raw, state,
             f"They acknowledged. They have {cart_count} item(s) in cart. Ask if they want to add more or confirm."
@@ -146,22 +269,23 @@ def execute(intent_result, state: ConversationState) -> str:
 
 def _handle_add_item(raw: str, state: ConversationState,
                      is_update: bool = False) -> str:
-    if len(state.items) >= MAX_CART_ITEMS:
+    if len(state.items_by_name) >= MAX_CART_ITEMS:
         return f"Your cart is full ({MAX_CART_ITEMS} items maximum)."
 
-    if " and " in raw:
-        raw = raw.split(" and ")[0].strip()
+    head, sep, _tail = raw.partition(" and ")
+    if sep:
+        raw = head.strip()
 
     parsed = parse_item(raw)
     state.slot_buffer.merge_from_parse(parsed)
     if is_update:
         state.slot_buffer.is_update = True
 
-    if state.phase == Phase.IDLE:
-        state.transition(Phase.SLOT_FILLING)
+    if state.phase == PHASE_IDLE:
+        state.transition(PHASE_SLOT_FILLING)
 
     if state.slot_buffer.is_complete():
-        state.transition(Phase.AWAITING_CONFIRM)
+        state.transition(PHASE_AWAITING_CONFIRM)
         buf    = state.slot_buffer
         action = "update" if buf.is_update else "add"
         more   = " more" if buf.is_accumulate else ""
@@ -178,7 +302,7 @@ def _handle_slot_response(raw: str, state: ConversationState) -> str:
     state.slot_buffer.merge_from_parse(parsed)
 
     if state.slot_buffer.is_complete():
-        state.transition(Phase.AWAITING_CONFIRM)
+        state.transition(PHASE_AWAITING_CONFIRM)
         buf    = state.slot_buffer
         action = "update" if buf.is_update else "add"
         more   = " more" if buf.is_accumulate else ""
@@ -190,49 +314,53 @@ def _handle_slot_response(raw: str, state: ConversationState) -> str:
     return _ask_for_missing(state.slot_buffer)
 
 
+_NAME_PROMPTS = (
+    "Which item would you like to add?",
+    "What item did you have in mind?",
+    "Could you tell me the item name? For example — rice, dal, or sugar.",
+)
+
+_QTY_TEMPLATES = (
+    "How much {name} would you like?",
+    "What quantity of {name} do you need?",
+    "Please tell me the amount of {name} — for example, 5 or 2.5.",
+)
+
+_UNIT_PROMPTS = (
+    "In what unit? For example: kg, gram, litre, or packet.",
+    "Should that be in kg, grams, litres, or packets?",
+    "Please specify the unit — kg, gram, litre, packet, or piece.",
+)
+
+
 def _ask_for_missing(buf: SlotBuffer) -> str:
     slot    = buf.next_missing()
-    attempt = getattr(buf, '_ask_count', 0)
+    attempt = buf._ask_count
     buf._ask_count = attempt + 1
 
     if slot == "name":
-        options = [
-            "Which item would you like to add?",
-            "What item did you have in mind?",
-            "Could you tell me the item name? For example — rice, dal, or sugar.",
-        ]
-        return options[min(attempt, len(options) - 1)]
+        return _NAME_PROMPTS[min(attempt, len(_NAME_PROMPTS) - 1)]
 
     if slot == "quantity":
         name = buf.name.title() if buf.name else "that item"
-        options = [
-            f"How much {name} would you like?",
-            f"What quantity of {name} do you need?",
-            f"Please tell me the amount of {name} — for example, 5 or 2.5.",
-        ]
-        return options[min(attempt, len(options) - 1)]
+        return _QTY_TEMPLATES[min(attempt, len(_QTY_TEMPLATES) - 1)].format(name=name)
 
     if slot == "unit":
-        options = [
-            "In what unit? For example: kg, gram, litre, or packet.",
-            "Should that be in kg, grams, litres, or packets?",
-            "Please specify the unit — kg, gram, litre, packet, or piece.",
-        ]
-        return options[min(attempt, len(options) - 1)]
+        return _UNIT_PROMPTS[min(attempt, len(_UNIT_PROMPTS) - 1)]
 
     return "Could you clarify your order? Try something like '5 kg rice'."
 
 
 # ── Confirmation handlers ─────────────────────────────────────────────────────
 
-def _handle_confirmed(state: ConversationState) -> str:
+async def _handle_confirmed(state: ConversationState) -> str:
     buf = state.slot_buffer
 
     if buf.is_order_confirm():
-        return _save_order(state)
+        return await _save_order(state)
 
     if not buf.is_complete():
-        state.force_transition(Phase.IDLE)
+        state.force_transition(PHASE_IDLE)
         buf.clear()
         return "Something went wrong. Let's start over — what would you like to add?"
 
@@ -242,7 +370,7 @@ def _handle_confirmed(state: ConversationState) -> str:
     is_accumulate = buf.is_accumulate
     is_update     = buf.is_update
 
-    existing = next((i for i in state.items if i["name"] == name), None)
+    existing = state.items_by_name.get(name)
 
     if existing:
         if is_accumulate:
@@ -256,11 +384,12 @@ def _handle_confirmed(state: ConversationState) -> str:
             existing["unit"]     = unit
             msg = f"Got it, updated {name.title()} to {quantity} {unit}."
     else:
-        state.items.append({"name": name, "quantity": quantity, "unit": unit})
+        state.items_by_name[name] = {"name": name, "quantity": quantity, "unit": unit}
         msg = f"Perfect! {quantity} {unit} of {name.title()} added to your cart."
 
+    state._cart_summary = None
     buf.clear()
-    state.transition(Phase.IDLE)
+    state.transition(PHASE_IDLE)
     return msg
 
 
@@ -269,16 +398,16 @@ def _handle_denied(state: ConversationState) -> str:
 
     if buf.is_order_confirm():
         buf.clear()
-        state.force_transition(Phase.IDLE)
+        state.force_transition(PHASE_IDLE)
         return "No problem, order not placed. Your cart is still saved. What would you like to do?"
 
-    if state.phase == Phase.SLOT_FILLING:
+    if state.phase == PHASE_SLOT_FILLING:
         buf.clear()
-        state.force_transition(Phase.IDLE)
+        state.force_transition(PHASE_IDLE)
         return "Sure, dropped that. What else would you like to add?"
 
     buf.clear()
-    state.force_transition(Phase.IDLE)
+    state.force_transition(PHASE_IDLE)
     return "Alright, no changes made. What would you like to do?"
 
 
@@ -288,9 +417,8 @@ def _handle_remove_item(raw: str, state: ConversationState) -> str:
     parsed = parse_item(raw)
     if not parsed.name:
         return "Which item would you like to remove?"
-    before      = len(state.items)
-    state.items = [i for i in state.items if i["name"] != parsed.name]
-    if len(state.items) < before:
+    if state.items_by_name.pop(parsed.name, None) is not None:
+        state._cart_summary = None
         return f"Removed {parsed.name.title()} from your cart."
     return f"I couldn't find {parsed.name} in your cart."
 
@@ -298,42 +426,47 @@ def _handle_remove_item(raw: str, state: ConversationState) -> str:
 # ── Cart formatters ───────────────────────────────────────────────────────────
 
 def _format_cart(state: ConversationState) -> str:
-    if not state.items:
+    if not state.items_by_name:
         return "Your cart is empty. You can start by saying something like 'add 5 kg rice'."
-    lines = [f"Here's your cart ({len(state.items)} item(s)):"]
-    for i, item in enumerate(state.items, 1):
+    lines = [f"Here's your cart ({len(state.items_by_name)} item(s)):"]
+    for i, item in enumerate(state.items_by_name.values(), 1):
         lines.append(f"  {i}. {item['name'].title()} — {item['quantity']} {item['unit']}")
     lines.append("\nWould you like to add more or confirm the order?")
     return "\n".join(lines)
 
 
 def _format_cart_inline(state: ConversationState) -> str:
-    return ", ".join(
-        f"{i['quantity']} {i['unit']} {i['name']}" for i in state.items
-    )
+    # Memoised on the state; cart mutations above reset it to None
+    if state._cart_summary is None:
+        state._cart_summary = ", ".join(
+            f"{i['quantity']} {i['unit']} {i['name']}" for i in state.items_by_name.values()
+        )
+    return state._cart_summary
 
 
 # ── Save order ────────────────────────────────────────────────────────────────
 
-def _save_order(state: ConversationState) -> str:
+async def _save_order(state: ConversationState) -> str:
     try:
-        from shared.database.mongo_client import get_db
-        db    = get_db()
+        # Async client — the insert round-trip no longer blocks the event loop
+        from shared.database.mongo_client import get_async_db
+        db    = get_async_db()
         order = {
             "order_id":   str(uuid.uuid4()),
             "session_id": state.session_id,
-            "items":      state.items.copy(),
+            "items":      state.items,
             "created_at": datetime.utcnow(),
         }
-        db.orders.insert_one(order)
+        await db.orders.insert_one(order)
         order_id = order["order_id"]
     except Exception as e:
         print(f"[Executor] DB save failed: {e}")
         order_id = str(uuid.uuid4()) + " (not persisted)"
 
-    state.items = []
+    state.items_by_name.clear()
+    state._cart_summary = None
     state.slot_buffer.clear()
-    state.force_transition(Phase.IDLE)
+    state.force_transition(PHASE_IDLE)
 
     return (
         f"Your order has been confirmed!\n"
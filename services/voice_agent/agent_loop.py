@@ -5,6 +5,7 @@
 
 import sys
 import os
+import asyncio
 
 # Make sure all modules are importable
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -13,11 +14,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'llm'))
 
 from memory_manager import MemoryManager
 from decision_engine import decide
-from action_executor import execute
+from action_executor import execute, collect_response
 from constants import MAX_TURNS_PER_SESSION
 
 
-def run_agent(session_id: str = "local_user"):
+async def run_agent(session_id: str = "local_user"):
     """
     Starts an interactive text session.
     In production this will be called by conversation_controller.py
@@ -28,7 +29,7 @@ def run_agent(session_id: str = "local_user"):
     # Always start a completely fresh state — never resume mid-session
     from conversation_state import ConversationState
     state = ConversationState(session_id=session_id)
-    memory._cache[session_id] = state
+    memory._cache_put(session_id, state)
 
     print()
     print("=" * 50)
@@ -43,7 +44,8 @@ def run_agent(session_id: str = "local_user"):
     while True:
         try:
             # ── Get input ─────────────────────────────────────────────────────
-            user_input = input("You: ").strip()
+            # input() blocks — run it on a worker thread so the loop stays free
+            user_input = (await asyncio.to_thread(input, "You: ")).strip()
 
             if not user_input:
                 continue
@@ -53,27 +55,26 @@ def run_agent(session_id: str = "local_user"):
                 print("Agent: We've reached the session limit. Please call again.")
                 break
 
-            # ── Save user turn to history ─────────────────────────────────────
-            memory.add_history(state, "user", user_input)
-
             # ── Step 1: Classify intent ───────────────────────────────────────
             intent_result = decide(user_input, state)
 
             # ── Step 2: Execute and get response ─────────────────────────────
-            response = execute(intent_result, state)
+            response = await collect_response(await execute(intent_result, state))
+            is_exit  = response == "__EXIT__"
+            if is_exit:
+                response = "Thank you for your order. Goodbye!"
 
-            # ── Step 3: Persist state ─────────────────────────────────────────
-            memory.save_session(state)
+            # ── Step 3: Record both sides of the turn and persist — one write ─
+            memory.commit_turn(state, user_input, response)
 
             # ── Step 4: Handle exit ───────────────────────────────────────────
-            if response == "__EXIT__":
-                print("Agent: Thank you for your order. Goodbye!")
+            if is_exit:
+                print(f"Agent: {response}")
                 break
 
-            # ── Step 5: Print response and save to history ────────────────────
+            # ── Step 5: Print response ────────────────────────────────────────
             print(f"Agent: {response}")
             print()
-            memory.add_history(state, "agent", response)
 
         except KeyboardInterrupt:
             print("\nAgent: Session ended. Goodbye!")
@@ -85,5 +86,5 @@ def run_agent(session_id: str = "local_user"):
 
 
 if __name__ == "__main__":
-    run_agent()
+    asyncio.run(run_agent())
 
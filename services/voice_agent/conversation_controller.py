@@ -3,9 +3,19 @@
 
 import asyncio
 import os
-import sys
+from collections import deque
+import re
 import struct
+import sys
 from pathlib import Path
+from typing import AsyncIterator
+
+import numpy as np
+
+try:
+    from numba import njit   # optional JIT for the per-frame VAD energy
+except ImportError:
+    njit = None
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 sys.path.insert(0, str(Path(__file__).resolve().parents[0]))
@@ -18,13 +28,59 @@ from livekit import rtc
 from shared.logging.logger import get_logger
 from memory_manager import MemoryManager
 from decision_engine import decide
-from action_executor import execute
+from action_executor import execute, warm_llm
 from conversation_state import ConversationState
 from stt.sarvam_stt import SarvamSTT
 from tts.sarvam_tts import SarvamTTS
+from tts.pcm import wav_to_pcm
 
 logger = get_logger("conversation_controller")
 
+# Split streamed LLM text into sentences so TTS can start on the first one
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+async def _stream_sentences(chunks: AsyncIterator[str], spoken: list) -> AsyncIterator[str]:
+    """Re-chunk streamed LLM text into whole sentences, recording each in spoken."""
+    pending = ""
+    async for chunk in chunks:
+        pending += chunk
+        *sentences, pending = _SENTENCE_END.split(pending)
+        for sentence in sentences:
+            spoken.append(sentence)
+            yield sentence
+    if pending.strip():
+        spoken.append(pending.strip())
+        yield pending.strip()
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _frame_energy(samples):
+        """Mean |sample| over an int16 frame, in one pass with no temporaries."""
+        total = 0
+        for v in samples:
+            total += abs(np.int32(v))
+        return total / samples.size
+
+    # Compile at import rather than on the caller's first frame
+    _frame_energy(np.zeros(160, dtype=np.int16))
+else:
+    def _frame_energy(samples: np.ndarray) -> float:
+        """Mean |sample| over an int16 frame; int32 so abs(-32768) fits."""
+        return float(np.abs(samples.astype(np.int32)).mean())
+
+
+def _wav_header(n_bytes: int, sr: int = 16000, ch: int = 1, bps: int = 16) -> bytes:
+    """44-byte canonical PCM WAV header for n_bytes of audio data."""
+    block_align = ch * bps // 8
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + n_bytes, b"WAVE",
+        b"fmt ", 16, 1, ch, sr, sr * block_align, block_align, bps,
+        b"data", n_bytes,
+    )
+
 
 class ConversationController:
     def __init__(self, room: rtc.Room, session_id: str):
@@ -32,9 +88,10 @@ class ConversationController:
         self.session_id = session_id
         self.memory     = MemoryManager()
         self.state      = ConversationState(session_id=session_id)
-        self.memory._cache[session_id] = self.state
+        self.memory._cache_put(session_id, self.state)
+        self._closed    = asyncio.Event()   # set once the room disconnects
         self.stt        = SarvamSTT()
-        self.tts        = SarvamTTS()
+        self.tts        = SarvamTTS(sample_rate=16000)   # = SAMPLE_RATE below
         self._audio_buf = bytearray()
         self._silence   = 0
         self._speaking  = False
@@ -43,13 +100,37 @@ class ConversationController:
         self.CHANNELS       = 1
         self.SILENCE_FRAMES = 25    # ~1.25s silence = end of utterance
         self.MIN_SPEECH_MS  = 400   # ignore clips shorter than this
-        self.VAD_THRESHOLD  = 150   # energy threshold — lower = more sensitive
+        self.VAD_THRESHOLD  = 150   # energy floor — lower = more sensitive
+        self.VAD_PEAK_RATIO = 0.1   # also require >10% of the recent peak energy
+        self.VAD_DEBOUNCE   = 3     # majority vote over this many frames
         self._source        = None
+        self._frame_count   = 0
+        self._energy_ring   = deque(maxlen=64)               # recent frame energies
+        self._vad_flags     = deque(maxlen=self.VAD_DEBOUNCE)
+        self._preroll       = deque(maxlen=self.VAD_DEBOUNCE)  # frames before onset
+
+        # Playback frames are built once and refilled in place. capture_frame
+        # has consumed a frame's buffer by the time it returns, so a small
+        # round-robin pool is enough.
+        samples_per_frame = self.SAMPLE_RATE // 100   # 10ms
+        self._frame_pool  = [
+            rtc.AudioFrame(
+                data=bytearray(samples_per_frame * self.CHANNELS * 2),
+                sample_rate=self.SAMPLE_RATE,
+                num_channels=self.CHANNELS,
+                samples_per_channel=samples_per_frame,
+            )
+            for _ in range(4)
+        ]
+        self._frame_views = [f.data.cast("B") for f in self._frame_pool]
 
     # ── Start ─────────────────────────────────────────────────────────────────
 
     async def start(self):
+        """Publishes the agent track, wires room events and greets the caller.
+        Returns once listening — await wait_closed() for the end of the call."""
         logger.info(f"[Controller] Session {self.session_id} started")
+        loop = asyncio.get_running_loop()
 
         # Set up audio output
         self._source = rtc.AudioSource(self.SAMPLE_RATE, self.CHANNELS)
@@ -66,6 +147,11 @@ class ConversationController:
         def on_participant(participant):
             logger.info(f"[Controller] Participant connected: {participant.identity}")
 
+        @self.room.on("disconnected")
+        def on_disconnected(reason=None):
+            # LiveKit may fire this off the loop thread — hand off safely
+            loop.call_soon_threadsafe(self._closed.set)
+
         @self.room.on("track_published")
         def on_published(pub, participant):
             logger.info(f"[Controller] Track published by {participant.identity}")
@@ -78,6 +164,9 @@ class ConversationController:
                 if pub.track:
                     asyncio.ensure_future(self._subscribe(pub.track))
 
+        # Warm the common-phrase audio cache in the background (no-op once done)
+        self._prewarm = asyncio.ensure_future(self.tts.prewarm(self.SAMPLE_RATE))
+
         # Greet caller
         await self._speak(
             "Hello! This is your monthly ration reminder. "
@@ -86,9 +175,11 @@ class ConversationController:
 
         logger.info("[Controller] Ready and listening...")
 
-        # Keep alive
-        while self.room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
-            await asyncio.sleep(1)
+    async def wait_closed(self):
+        """Sleeps until the room disconnects (no polling), then flushes the session."""
+        if self.room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
+            await self._closed.wait()
+        await self.memory.flush()
 
     # ── Audio subscription ────────────────────────────────────────────────────
 
@@ -107,23 +198,38 @@ class ConversationController:
         if self._agent_speaking:
             return
 
-        pcm = bytes(frame.data)
+        # Byte view over the frame's buffer — no per-frame bytes copy.
+        # frame.data is an int16 view, so cast to bytes for lengths/extend.
+        pcm = memoryview(frame.data).cast("B")
         if len(pcm) < 2:
             return
 
-        samples   = struct.unpack(f"{len(pcm)//2}h", pcm)
-        energy    = sum(abs(s) for s in samples) / max(len(samples), 1)
+        # Mean |sample| over the frame — a compiled loop when numba is
+        # installed, vectorised NumPy otherwise
+        samples   = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+        energy    = float(_frame_energy(samples))
+
+        # Adaptive threshold: the fixed floor, raised to a fraction of the
+        # loudest recent frame — so the quiet tail after speech counts as
+        # silence sooner and the endpoint is found earlier
+        self._energy_ring.append(energy)
+        threshold = max(self.VAD_THRESHOLD, max(self._energy_ring) * self.VAD_PEAK_RATIO)
 
         # Log energy every 50 frames so we can see what's coming in
-        if not hasattr(self, '_frame_count'):
-            self._frame_count = 0
         self._frame_count += 1
         if self._frame_count % 50 == 0:
-            logger.info(f"[Controller] Frame energy: {energy:.1f} (threshold: {self.VAD_THRESHOLD}), speaking: {self._speaking}")
+            logger.info(f"[Controller] Frame energy: {energy:.1f} (threshold: {threshold:.1f}), speaking: {self._speaking}")
 
-        is_speech = energy > self.VAD_THRESHOLD
+        # Debounce — a lone loud or quiet frame doesn't flip the state
+        self._vad_flags.append(energy > threshold)
+        is_speech = sum(self._vad_flags) * 2 > len(self._vad_flags)
 
         if is_speech:
+            if not self._speaking:
+                # Keep the onset frames the vote needed to confirm speech
+                for prev in self._preroll:
+                    self._audio_buf.extend(prev)
+                self._preroll.clear()
             self._speaking = True
             self._silence  = 0
             self._audio_buf.extend(pcm)
@@ -132,37 +238,43 @@ class ConversationController:
             self._audio_buf.extend(pcm)
             if self._silence >= self.SILENCE_FRAMES:
                 await self._flush_utterance()
+        else:
+            # Hold the view, not a copy — each frame owns its buffer, and the
+            # bytes are only copied if the frame is promoted into _audio_buf
+            self._preroll.append(pcm)
 
     # ── Utterance handler ─────────────────────────────────────────────────────
 
     async def _flush_utterance(self):
-        audio = bytes(self._audio_buf)
-        self._audio_buf.clear()
+        n_bytes = len(self._audio_buf)
         self._speaking = False
         self._silence  = 0
+        # Start the next utterance's vote and pre-roll from scratch, not
+        # from this one's trailing silence
+        self._vad_flags.clear()
+        self._preroll.clear()
 
-        duration_ms = len(audio) / (self.SAMPLE_RATE * self.CHANNELS * 2) * 1000
+        duration_ms = n_bytes / (self.SAMPLE_RATE * self.CHANNELS * 2) * 1000
         if duration_ms < self.MIN_SPEECH_MS:
+            self._audio_buf.clear()
             logger.info(f"[Controller] Utterance too short ({duration_ms:.0f}ms), skipping")
             return
 
         logger.info(f"[Controller] Utterance captured ({duration_ms:.0f}ms)")
 
-        # Wrap raw PCM in a proper WAV container before sending to STT
-        import wave, io
-        wav_buf = io.BytesIO()
-        with wave.open(wav_buf, 'wb') as wf:
-            wf.setnchannels(self.CHANNELS)
-            wf.setsampwidth(2)  # 16-bit
-            wf.setframerate(self.SAMPLE_RATE)
-            wf.writeframes(audio)
-        wav_bytes = wav_buf.getvalue()
+        # Wrap raw PCM in a WAV container before sending to STT: the format
+        # is fixed, so just prepend the header. The buffer is joined through
+        # a memoryview (one copy) and cleared once the view is released.
+        with memoryview(self._audio_buf) as audio:
+            wav_bytes = b"".join((_wav_header(n_bytes, self.SAMPLE_RATE, self.CHANNELS), audio))
+        self._audio_buf.clear()
 
         logger.info(f"[Controller] WAV prepared: {len(wav_bytes)} bytes")
 
-        # STT
-        transcript = await asyncio.get_event_loop().run_in_executor(
-            None, self.stt.transcribe, wav_bytes
+        # STT — the LLM connection is warmed while we wait on it, so a
+        # conversational reply doesn't also pay for the TLS handshake
+        transcript, _ = await asyncio.gather(
+            self.stt.transcribe(wav_bytes), warm_llm(),
         )
         if not transcript or not transcript.strip():
             logger.info("[Controller] Empty transcript, skipping")
@@ -172,74 +284,108 @@ class ConversationController:
 
         # Agent
         intent_result = decide(transcript, self.state)
-        response      = execute(intent_result, self.state)
-        self.memory.save_session(self.state)
+        response      = await execute(intent_result, self.state)
+        self.memory.save_session_async(self.state)
 
         if response == "__EXIT__":
             await self._speak("Thank you for your order. Goodbye!")
+            await self.memory.flush()
             await self.room.disconnect()
+            self._closed.set()
+            return
+
+        if isinstance(response, str):
+            logger.info(f"[Controller] Response: {response!r}")
+            await self._speak(response)
             return
 
-        logger.info(f"[Controller] Response: {response!r}")
-        await self._speak(response)
+        # Streamed reply — each sentence is sent to TTS as soon as it
+        # completes, while earlier ones are still playing
+        spoken = []
+        await self._speak_sentences(_stream_sentences(response, spoken))
+        logger.info(f"[Controller] Response: {' '.join(spoken)!r}")
+
     # ── TTS + playback ────────────────────────────────────────────────────────
 
     async def _speak(self, text: str):
+        async def sentences():
+            for part in _SENTENCE_END.split(text.strip()):
+                if part:
+                    yield part
+        await self._speak_sentences(sentences())
+
+    async def _speak_sentences(self, sentences: AsyncIterator[str]):
         if not self._source:
             return
 
         self._agent_speaking = True
+        # A producer starts synthesis for each sentence the moment it
+        # arrives; this task plays the results in order, so the first
+        # sentence is heard while later ones are generated and synthesized
+        queue:   asyncio.Queue = asyncio.Queue()
+        pending: list = []
+
+        async def produce():
+            try:
+                async for sentence in sentences:
+                    fut = asyncio.ensure_future(self._to_pcm(sentence))
+                    pending.append(fut)
+                    queue.put_nowait(fut)
+            finally:
+                queue.put_nowait(None)
+
+        producer = asyncio.ensure_future(produce())
         try:
-            audio_bytes = await asyncio.get_event_loop().run_in_executor(
-                None, self.tts.synthesize, text, None
-            )
-            if not audio_bytes:
-                return
-
-            import wave, io, numpy as np
-            from scipy import signal
-
-            with wave.open(io.BytesIO(audio_bytes)) as wf:
-                pcm_data     = wf.readframes(wf.getnframes())
-                src_rate     = wf.getframerate()
-                src_channels = wf.getnchannels()
-
-            logger.info(f"[Controller] TTS audio: {src_rate}Hz, {src_channels}ch, {len(pcm_data)} bytes")
+            while (fut := await queue.get()) is not None:
+                pcm_data = await fut
+                if pcm_data:
+                    await self._play(pcm_data)
+            await producer
 
-            # Convert to numpy
-            samples = np.frombuffer(pcm_data, dtype=np.int16).copy()
-
-            # Stereo → mono
-            if src_channels == 2:
-                samples = samples.reshape(-1, 2).mean(axis=1).astype(np.int16)
-
-            # Resample to 16kHz if needed
-            if src_rate != self.SAMPLE_RATE:
-                num_samples = int(len(samples) * self.SAMPLE_RATE / src_rate)
-                samples     = signal.resample(samples, num_samples).astype(np.int16)
-
-            pcm_data = samples.tobytes()
-
-            # Push in 10ms frames
-            samples_per_frame = self.SAMPLE_RATE // 100
-            bytes_per_frame   = samples_per_frame * 2
-
-            for i in range(0, len(pcm_data), bytes_per_frame):
-                chunk = pcm_data[i:i + bytes_per_frame]
-                if len(chunk) < bytes_per_frame:
-                    chunk = chunk + b'\x00' * (bytes_per_frame - len(chunk))
-                frame = rtc.AudioFrame(
-                    data=chunk,
-                    sample_rate=self.SAMPLE_RATE,
-                    num_channels=self.CHANNELS,
-                    samples_per_channel=samples_per_frame,
-                )
-                await self._source.capture_frame(frame)
-                await asyncio.sleep(0.01)
+            # Stay in "speaking" until the queued audio has actually played,
+            # so the VAD doesn't pick up the tail of our own voice
+            await self._source.wait_for_playout()
 
             logger.info("[Controller] Finished speaking")
 
         except Exception as e:
             logger.error(f"[Controller] TTS/playback error: {e}", exc_info=True)
         finally:
-            self._agent_speaking = False
\ No newline at end of file
+            producer.cancel()
+            for fut in pending:
+                fut.cancel()
+            self._agent_speaking = False
+
+    async def _to_pcm(self, text: str):
+        """16kHz mono PCM for one sentence, or None if synthesis failed."""
+        # Common phrases come pre-decoded at our rate; everything else is
+        # synthesized, then downmixed/resampled to 16kHz mono
+        pcm_data = self.tts.get_pcm(text, self.SAMPLE_RATE)
+        if pcm_data is None:
+            audio_bytes = await self.tts.synthesize(text)
+            if not audio_bytes:
+                return None
+            pcm_data = wav_to_pcm(audio_bytes, self.SAMPLE_RATE)
+
+        logger.info(f"[Controller] TTS audio: {len(pcm_data)} bytes at {self.SAMPLE_RATE}Hz")
+        return pcm_data
+
+    async def _play(self, pcm_data: bytes):
+        # Pad once to a whole number of frames, then slice views — no
+        # per-frame bytes copies
+        bytes_per_frame = len(self._frame_views[0])
+        pad      = -len(pcm_data) % bytes_per_frame
+        if pad:
+            pcm_data += b'\x00' * pad
+        pcm_view = memoryview(pcm_data)
+        pool     = self._frame_pool
+        views    = self._frame_views
+        size     = len(pool)
+
+        # Push 10ms frames back-to-back. AudioSource buffers internally
+        # and capture_frame only blocks when that queue is full, so it
+        # paces us — no fixed sleep per frame.
+        for n, i in enumerate(range(0, len(pcm_data), bytes_per_frame)):
+            slot = n % size
+            views[slot][:] = pcm_view[i:i + bytes_per_frame]
+            await self._source.capture_frame(pool[slot])
\ No newline at end of file
@@ -7,22 +7,22 @@ import os
 import json
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
 from shared.logging.logger import get_logger
 
 logger = get_logger("decision_engine")
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
-
 from constants import (
     AFFIRM_WORDS, DENY_WORDS, EXIT_WORDS,
     SHOW_CART_WORDS, CONFIRM_ORDER_WORDS,
     UPDATE_WORDS, REMOVE_WORDS, KNOWN_ITEMS,
     KNOWN_UNITS, MAX_LLM_CALLS_PER_SESSION,
 )
-from conversation_state import ConversationState, Phase
+from conversation_state import ConversationState, PHASE_AWAITING_CONFIRM, PHASE_SLOT_FILLING
 
 
 # ── Result type ───────────────────────────────────────────────────────────────
@@ -36,90 +36,135 @@ class IntentResult:
 
 # ── Vocabulary sets ───────────────────────────────────────────────────────────
 
-ACKNOWLEDGEMENTS = {
+ACKNOWLEDGEMENTS = frozenset({
     "okay", "ok", "alright", "great", "fine", "cool", "sure",
     "thanks", "thank", "nice", "good", "perfect", "wonderful",
     "aight", "gotcha", "noted", "understood", "makes sense",
-}
+})
 
-IDLE_DEAD_ENDS = {
+IDLE_DEAD_ENDS = frozenset({
     "no", "nope", "nah", "nothing", "nevermind", "never", "mind",
     "forget", "leave", "drop", "skip", "ignore",
-}
+})
+
+GREETINGS = frozenset({"hello", "hi", "hey", "heya", "hiya"})
+
+# Built once — these were rebuilt on every decide() call
+_ACK_OR_DEAD_END = ACKNOWLEDGEMENTS | IDLE_DEAD_ENDS
+_DIGIT_RE        = re.compile(r"\d")
 
 
 # ── Main entry point ──────────────────────────────────────────────────────────
 
 def decide(user_input: str, state: ConversationState) -> IntentResult:
-    text   = user_input.lower().strip()
-    tokens = set(text.split())
-
-    # ── Phase: AWAITING_CONFIRM ───────────────────────────────────────────────
-    if state.phase == Phase.AWAITING_CONFIRM:
-        if tokens & AFFIRM_WORDS:
-            return IntentResult(intent="user_confirmed", raw_text=text)
-        if tokens & DENY_WORDS:
-            return IntentResult(intent="user_denied", raw_text=text)
-        return IntentResult(intent="confirmation_unclear", raw_text=text)
-
-    # ── Phase: SLOT_FILLING ───────────────────────────────────────────────────
-    if state.phase == Phase.SLOT_FILLING:
-        if tokens & EXIT_WORDS:
-            return IntentResult(intent="exit", raw_text=text)
-        if tokens & DENY_WORDS:
-            return IntentResult(intent="user_denied", raw_text=text)
-        return IntentResult(intent="slot_response", raw_text=text)
-
-    # ── Phase: IDLE ───────────────────────────────────────────────────────────
+    text = user_input.lower().strip()
+
+    # Short replies ("yes", "no", "ok") repeat constantly — memoise them
+    if len(text) < _CACHE_MAX_LEN:
+        intent = _classify_cached(state.phase, text)
+    else:
+        intent = _classify(state.phase, text)
+    if intent is not None:
+        return IntentResult(intent=intent, raw_text=text)
+
+    # ── LLM fallback — only for genuinely ambiguous inputs ───────────────────
+    if state.llm_calls >= MAX_LLM_CALLS_PER_SESSION:
+        return IntentResult(intent="clarify", raw_text=text)
+
+    return _llm_classify(text, state)
+
+
+# ── Deterministic rules ───────────────────────────────────────────────────────
+# One flat rule list per phase, picked by a dict lookup. Each returns an
+# intent name, or None when only the LLM can decide. They depend on nothing
+# but (phase, text), so results are safe to cache.
+
+_CACHE_MAX_LEN = 32
+
 
+def _classify(phase: str, text: str) -> Optional[str]:
+    return _PHASE_HANDLERS.get(phase, _decide_idle)(text, set(text.split()))
+
+
+_classify_cached = lru_cache(maxsize=2048)(_classify)
+
+
+def _decide_awaiting_confirm(text: str, tokens: set) -> Optional[str]:
+    if not AFFIRM_WORDS.isdisjoint(tokens):
+        return "user_confirmed"
+    if not DENY_WORDS.isdisjoint(tokens):
+        return "user_denied"
+    return "confirmation_unclear"
+
+
+def _decide_slot_filling(text: str, tokens: set) -> Optional[str]:
+    if not EXIT_WORDS.isdisjoint(tokens):
+        return "exit"
+    if not DENY_WORDS.isdisjoint(tokens):
+        return "user_denied"
+    return "slot_response"
+
+
+def _decide_idle(text: str, tokens: set) -> Optional[str]:
     # Exit
-    if tokens & EXIT_WORDS:
-        return IntentResult(intent="exit", raw_text=text)
+    if not EXIT_WORDS.isdisjoint(tokens):
+        return "exit"
 
     # Show cart
-    if tokens & SHOW_CART_WORDS:
-        return IntentResult(intent="show_cart", raw_text=text)
+    if not SHOW_CART_WORDS.isdisjoint(tokens):
+        return "show_cart"
 
     # Confirm order
-    if tokens & CONFIRM_ORDER_WORDS:
-        return IntentResult(intent="confirm_order", raw_text=text)
+    if not CONFIRM_ORDER_WORDS.isdisjoint(tokens):
+        return "confirm_order"
 
     # Greeting — short inputs only
-    if tokens & {"hello", "hi", "hey", "heya", "hiya"} and len(tokens) <= 3:
-        return IntentResult(intent="greeting", raw_text=text)
+    if not GREETINGS.isdisjoint(tokens) and len(tokens) <= 3:
+        return "greeting"
 
     # Acknowledgements and dead-ends — never hit LLM for these
-    if tokens & (ACKNOWLEDGEMENTS | IDLE_DEAD_ENDS) and not (tokens & KNOWN_ITEMS) and not re.search(r'\d', text):
-        return IntentResult(intent="acknowledgement", raw_text=text)
+    has_digit = _DIGIT_RE.search(text) is not None
+    if not _ACK_OR_DEAD_END.isdisjoint(tokens) and KNOWN_ITEMS.isdisjoint(tokens) and not has_digit:
+        return "acknowledgement"
 
     # Remove item
-    if tokens & REMOVE_WORDS:
-        return IntentResult(intent="remove_item", raw_text=text)
+    if not REMOVE_WORDS.isdisjoint(tokens):
+        return "remove_item"
 
     # Update item
-    if tokens & UPDATE_WORDS:
-        return IntentResult(intent="update_item", raw_text=text)
+    if not UPDATE_WORDS.isdisjoint(tokens):
+        return "update_item"
 
     # Digits or known units → add_item
-    if re.search(r'\d', text):
-        return IntentResult(intent="add_item", raw_text=text)
+    if has_digit:
+        return "add_item"
 
-    if tokens & KNOWN_UNITS:
-        return IntentResult(intent="add_item", raw_text=text)
+    if not KNOWN_UNITS.isdisjoint(tokens):
+        return "add_item"
 
     # Known item word → add_item
-    if tokens & KNOWN_ITEMS:
-        return IntentResult(intent="add_item", raw_text=text)
+    if not KNOWN_ITEMS.isdisjoint(tokens):
+        return "add_item"
 
-    # ── LLM fallback — only for genuinely ambiguous inputs ───────────────────
-    if state.llm_calls >= MAX_LLM_CALLS_PER_SESSION:
-        return IntentResult(intent="clarify", raw_text=text)
+    return None
 
-    return _llm_classify(text, state)
+
+# IDLE and CONFIRMED (and anything else) fall through to _decide_idle
+_PHASE_HANDLERS = {
+    PHASE_AWAITING_CONFIRM: _decide_awaiting_confirm,
+    PHASE_SLOT_FILLING:     _decide_slot_filling,
+}
 
 
 # ── LLM classifier ────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=1)
+def _groq_api_key() -> Optional[str]:
+    """Reads .env on the first LLM call rather than at import."""
+    load_dotenv(dotenv_path=Path(__file__).resolve().parents[3] / ".env")
+    return os.getenv("GROQ_API_KEY")
+
+
 def _llm_classify(text: str, state: ConversationState) -> IntentResult:
     allowed_intents = [
         "add_item", "update_item", "remove_item",
@@ -129,7 +174,7 @@ def _llm_classify(text: str, state: ConversationState) -> IntentResult:
 
     cart_summary = [
         f"{i['quantity']} {i['unit']} {i['name']}"
-        for i in state.items
+        for i in state.items_by_name.values()
     ]
 
     prompt = f"""You are an intent classifier for a ration ordering phone agent.
@@ -148,7 +193,7 @@ Respond with ONLY valid JSON, no explanation, no markdown:
 
     try:
         from groq import Groq
-        client   = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        client   = Groq(api_key=_groq_api_key())
         response = client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[{"role": "user", "content": prompt}],
@@ -2,16 +2,34 @@
 # Loads and saves ConversationState to MongoDB.
 # In-process cache avoids redundant DB reads within the same session.
 
+import asyncio
+import copy
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from conversation_state import ConversationState, Phase, SlotBuffer
+from conversation_state import ConversationState, SlotBuffer
+from constants import SESSION_CACHE_MAX_SIZE, SESSION_CACHE_TTL_S
 
 
 class MemoryManager:
 
     def __init__(self):
         # In-process cache: session_id -> ConversationState
-        # Avoids hitting MongoDB on every single turn
-        self._cache: dict = {}
+        # Avoids hitting MongoDB on every single turn.
+        # LRU-ordered and bounded — idle or excess sessions are evicted and
+        # reloaded from MongoDB if they come back.
+        self._cache: OrderedDict = OrderedDict()
+        self._touched: dict = {}
+        # The API calls in from worker threads (asyncio.to_thread), so every
+        # cache read/write/eviction goes through this lock
+        self._lock = threading.Lock()
+        # Last document written to / read from MongoDB, per session.
+        # save_session diffs against it and skips the write if nothing changed.
+        self._persisted: dict = {}
+        # Snapshots queued by save_session_async, latest per session only
+        self._pending: dict = {}
+        self._writer  = None
         self._db = None
 
     def _get_db(self):
@@ -37,8 +55,9 @@ class MemoryManager:
         Checks cache first, then MongoDB, then creates fresh state.
         """
         # 1. Return from cache if available
-        if session_id in self._cache:
-            return self._cache[session_id]
+        state = self._cache_get(session_id)
+        if state is not None:
+            return state
 
         # 2. Try loading from MongoDB
         db = self._get_db()
@@ -47,42 +66,145 @@ class MemoryManager:
                 doc = db.sessions.find_one({"session_id": session_id})
                 if doc:
                     state = ConversationState.from_mongo_doc(doc)
-                    self._cache[session_id] = state
+                    self._cache_put(session_id, state)
+                    self._remember_persisted(session_id, copy.deepcopy(state.to_mongo_doc()))
                     return state
             except Exception as e:
                 print(f"[MemoryManager] WARNING: Could not load session: {e}")
 
         # 3. Fresh state
         state = ConversationState(session_id=session_id)
-        self._cache[session_id] = state
+        self._cache_put(session_id, state)
         return state
 
+    # ── Cache bounds ──────────────────────────────────────────────────────────
+
+    def _cache_get(self, session_id: str):
+        with self._lock:
+            state = self._cache.get(session_id)
+            if state is not None:
+                self._touch(session_id)
+            return state
+
+    def _cache_put(self, session_id: str, state: ConversationState) -> None:
+        with self._lock:
+            self._cache[session_id] = state
+            self._touch(session_id)
+
+    def _touch(self, session_id: str) -> None:
+        # Caller holds self._lock
+        self._cache.move_to_end(session_id)
+        self._touched[session_id] = time.monotonic()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drops least-recently-used sessions that are idle or over the size cap."""
+        now = time.monotonic()
+        while self._cache:
+            oldest = next(iter(self._cache))
+            idle   = now - self._touched.get(oldest, now)
+            if len(self._cache) <= SESSION_CACHE_MAX_SIZE and idle < SESSION_CACHE_TTL_S:
+                break
+            self._cache.pop(oldest, None)
+            self._touched.pop(oldest, None)
+            self._persisted.pop(oldest, None)
+
     # ── Session save ──────────────────────────────────────────────────────────
 
     def save_session(self, state: ConversationState) -> None:
         """
         Saves ConversationState to MongoDB.
         Always updates cache regardless of DB success.
+        Only fields that changed since the last write are sent;
+        if nothing changed, no write happens at all.
         """
         # Always update cache
-        self._cache[state.session_id] = state
+        self._cache_put(state.session_id, state)
+        self._write(state.session_id, state.to_mongo_doc())
 
-        # Try persisting to MongoDB
+    def save_session_async(self, state: ConversationState) -> None:
+        """
+        Fire-and-forget save_session for the voice pipeline: updates the
+        cache now and hands the MongoDB write to a background task, so the
+        turn doesn't wait on the round-trip. Must be called from the event
+        loop. Repeated saves of one session before the write lands are
+        coalesced into a single write of the latest state.
+        """
+        self._cache_put(state.session_id, state)
+        # Snapshot now — the live state keeps changing while the write is queued
+        self._pending[state.session_id] = copy.deepcopy(state.to_mongo_doc())
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._drain())
+
+    async def flush(self) -> None:
+        """Waits for any queued background writes to finish."""
+        if self._writer is not None:
+            await self._writer
+
+    async def _drain(self) -> None:
+        while self._pending:
+            session_id = next(iter(self._pending))
+            doc = self._pending.pop(session_id)
+            await asyncio.to_thread(self._write, session_id, doc, False)
+
+    def _write(self, session_id: str, doc: dict, shared: bool = True) -> None:
+        """
+        Persists doc to MongoDB, sending only the fields that changed since
+        the last write. shared=False means doc is already a private copy.
+        """
         db = self._get_db()
-        if db is not None:
-            try:
-                doc = state.to_mongo_doc()
-                doc["updated_at"] = datetime.utcnow()
-                db.sessions.update_one(
-                    {"session_id": state.session_id},
-                    {"$set": doc},
-                    upsert=True
-                )
-            except Exception as e:
-                print(f"[MemoryManager] WARNING: Could not save session: {e}")
+        if db is None:
+            return
+        with self._lock:
+            # Copy the snapshot's top level — other threads update it in place
+            last = dict(self._persisted.get(session_id, ()))
+        diff = {k: v for k, v in doc.items() if k not in last or last[k] != v}
+        if not diff:
+            return
+        update = {"$set": {**diff, "updated_at": datetime.utcnow()}}
+
+        # History only ever grows — push the new entries instead of
+        # rewriting the whole array when the stored copy is a prefix
+        prev = last.get("history")
+        new  = diff.get("history")
+        if prev and new is not None and new[:len(prev)] == prev:
+            del update["$set"]["history"]
+            update["$push"] = {"history": {"$each": new[len(prev):]}}
+        try:
+            db.sessions.update_one(
+                {"session_id": session_id},
+                update,
+                upsert=True
+            )
+            # Snapshot by value — doc may share list/dict objects with state
+            self._remember_persisted(
+                session_id,
+                {k: copy.deepcopy(v) for k, v in diff.items()} if shared else diff,
+            )
+        except Exception as e:
+            print(f"[MemoryManager] WARNING: Could not save session: {e}")
+
+    def _remember_persisted(self, session_id: str, fields: dict) -> None:
+        """
+        Records fields as written to MongoDB. Skipped once the session has
+        been evicted, so a late write can't leave a snapshot behind that
+        nothing would ever evict.
+        """
+        with self._lock:
+            if session_id in self._cache:
+                self._persisted.setdefault(session_id, {}).update(fields)
 
     # ── History ───────────────────────────────────────────────────────────────
 
+    def commit_turn(self, state: ConversationState, user_msg: str, agent_msg: str) -> None:
+        """
+        Records both sides of a turn and persists the session in one write.
+        Call once the agent reply is final (i.e. after a stream completes).
+        """
+        self.add_history(state, "user",  user_msg)
+        self.add_history(state, "agent", agent_msg)
+        self.save_session(state)
+
     def add_history(self, state: ConversationState, speaker: str, text: str) -> None:
         """
         Appends a turn to conversation history.
@@ -4,10 +4,15 @@
 # Output: transcript string
 # No business logic here — pure API wrapper.
 
+import asyncio
 import os
+import weakref
 import httpx
+import orjson
 from dotenv import load_dotenv
 
+from shared.utils.circuit_breaker import sarvam_stt_breaker
+
 load_dotenv()
 
 SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
@@ -16,6 +21,22 @@ SARVAM_API_KEY = os.getenv("SARVAM_API_KEY")
 # Supported languages — use "hi-IN" for Hindi, "en-IN" for English
 DEFAULT_LANGUAGE = "unknown"
 
+# One pooled client per event loop — keeps the TLS connection to Sarvam warm
+# across turns instead of handshaking on every utterance
+# Its pooled connections belong to the loop that opened them, so a client
+# is never shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_client() -> httpx.AsyncClient:
+    loop   = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4)
+        )
+    return client
+
 
 class SarvamSTT:
 
@@ -26,7 +47,7 @@ class SarvamSTT:
         if not SARVAM_API_KEY:
             raise ValueError("SARVAM_API_KEY not found in environment.")
 
-    def transcribe(self, audio_bytes: bytes, filename: str = "audio.wav") -> str:
+    async def transcribe(self, audio_bytes: bytes, filename: str = "audio.wav") -> str:
         """
         Sends audio bytes to Sarvam STT API.
         Returns transcript string.
@@ -40,25 +61,23 @@ class SarvamSTT:
             return ""
 
         try:
-            from shared.utils.circuit_breaker import sarvam_stt_breaker, CircuitOpenError
-
-            def _call():
-                with httpx.Client(timeout=self.timeout) as client:
-                    return client.post(
-                        SARVAM_STT_URL,
-                        headers={"api-subscription-key": SARVAM_API_KEY},
-                        files={"file": (filename, audio_bytes, "audio/wav")},
-                        data={
-                            "language_code":   self.language,
-                            "model":           "saarika:v2.5",
-                            "with_timestamps": "false",
-                        }
-                    )
-
-            response = sarvam_stt_breaker.call(_call)
+            async def _call():
+                return await _get_client().post(
+                    SARVAM_STT_URL,
+                    headers={"api-subscription-key": SARVAM_API_KEY},
+                    files={"file": (filename, audio_bytes, "audio/wav")},
+                    data={
+                        "language_code":   self.language,
+                        "model":           "saarika:v2.5",
+                        "with_timestamps": "false",
+                    },
+                    timeout=self.timeout,
+                )
+
+            response = await sarvam_stt_breaker.acall(_call)
 
             if response.status_code == 200:
-                result        = response.json()
+                result        = orjson.loads(response.content)
                 transcript    = result.get("transcript", "").strip()
                 detected_lang = result.get("language_code", "unknown")
                 print(f"[STT] Transcript: {transcript!r} | Language: {detected_lang}")
@@ -73,7 +92,7 @@ class SarvamSTT:
 
       
 
-    def transcribe_file(self, file_path: str) -> str:
+    async def transcribe_file(self, file_path: str) -> str:
         """
         Convenience method — reads a WAV file and transcribes it.
         Useful for testing without a live audio stream.
@@ -82,7 +101,7 @@ class SarvamSTT:
             with open(file_path, "rb") as f:
                 audio_bytes = f.read()
             filename = os.path.basename(file_path)
-            return self.transcribe(audio_bytes, filename)
+            return await self.transcribe(audio_bytes, filename)
         except FileNotFoundError:
             print(f"[STT] File not found: {file_path}")
             return ""
\ No newline at end of file
@@ -0,0 +1,52 @@
+# services/voice_agent/tts/pcm.py
+# Turns TTS WAV output into playback-ready PCM: 16-bit, mono, target rate.
+# Shared by the conversation controller and SarvamTTS.prewarm().
+
+import io
+import math
+import wave
+
+import numpy as np
+
+try:
+    import soxr   # fast band-limited resampler; optional
+except ImportError:
+    soxr = None
+    from scipy.signal import resample_poly
+
+
+def resample(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """
+    int16 -> int16 resample. Uses soxr when installed, otherwise scipy's
+    polyphase filter — both far cheaper than an FFT over the whole clip.
+    """
+    if soxr is not None:
+        return soxr.resample(samples, src_rate, dst_rate, quality="HQ")
+    g   = math.gcd(src_rate, dst_rate)
+    out = resample_poly(samples, dst_rate // g, src_rate // g)
+    return np.clip(out, -32768, 32767).astype(np.int16)
+
+
+def wav_to_pcm(wav_bytes: bytes, target_rate: int) -> bytes:
+    """Decodes WAV bytes to raw int16 mono PCM at target_rate."""
+    with wave.open(io.BytesIO(wav_bytes)) as wf:
+        pcm_data     = wf.readframes(wf.getnframes())
+        src_rate     = wf.getframerate()
+        src_channels = wf.getnchannels()
+
+    # Already in playback format — hand the decoded bytes straight through
+    if src_channels == 1 and src_rate == target_rate:
+        return pcm_data
+
+    samples = np.frombuffer(pcm_data, dtype=np.int16)
+
+    # Stereo → mono before resampling, so the resampler only sees half the
+    # data; summed in int32 rather than via a float64 mean() temporary
+    if src_channels == 2:
+        stereo  = samples.reshape(-1, 2)
+        samples = ((stereo[:, 0].astype(np.int32) + stereo[:, 1]) >> 1).astype(np.int16)
+
+    if src_rate != target_rate:
+        samples = resample(samples, src_rate, target_rate)
+
+    return samples.tobytes()
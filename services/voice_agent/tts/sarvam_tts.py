@@ -5,11 +5,19 @@
 # Includes local cache for common phrases to avoid redundant API calls.
 
 import os
+import re
 import base64
-import hashlib
+import asyncio
+import weakref
 import httpx
+import orjson
+from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
 
+from shared.utils.circuit_breaker import sarvam_tts_breaker
+from .pcm import wav_to_pcm
+
 load_dotenv()
 
 SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
@@ -17,35 +25,105 @@ SARVAM_API_KEY = os.getenv("SARVAM_API_KEY")
 
 DEFAULT_LANGUAGE = "en-IN"
 DEFAULT_SPEAKER  = "anushka"  # options: meera, pavithra, maitreyi, arvind, amol
+# Ask Sarvam for audio at the LiveKit playback rate, so the WAV it returns
+# is already 16kHz mono and needs no resampling on our side
+DEFAULT_SAMPLE_RATE = 16000
 
-# Common phrases said on every call — cached at startup to save API calls
+# Common phrases said on every call — cached at startup to save API calls.
+# The controller speaks one sentence at a time, so each entry is exactly one
+# sentence as it is split there; a multi-sentence entry would never be hit.
 CACHEABLE_PHRASES = [
-    "How much would you like?",
-    "In what unit? For example: kg, gram, litre, or packet.",
-    "Which item would you like to order?",
-    "Shall I add this to your cart? Say yes or no.",
+    # Greeting and goodbye (conversation_controller)
+    "Hello!",
+    "This is your monthly ration reminder.",
+    "What items would you like to order this month?",
+    "Thank you for your order.",
+    "Goodbye!",
+    # Slot prompts and fixed replies (action_executor)
+    "Which item would you like to add?",
+    "What item did you have in mind?",
+    "Could you tell me the item name?",
+    "For example — rice, dal, or sugar.",
+    "In what unit?",
+    "For example: kg, gram, litre, or packet.",
+    "Should that be in kg, grams, litres, or packets?",
+    "Please specify the unit — kg, gram, litre, packet, or piece.",
+    "Which item would you like to remove?",
     "Your cart is empty.",
+    "You can start by saying something like 'add 5 kg rice'.",
+    "You want to place this order?",
     "Say yes to confirm or no to cancel.",
-    "Are you still there?",
-    "Thank you for your order. Goodbye!",
-    "Hello! This is your monthly ration reminder.",
-    "What items would you like to order this month?",
+    "What items would you like to order today?",
 ]
 
+# Devanagari block — any match counts one Hindi character
+_DEVANAGARI = re.compile("[\u0900-\u097F]")
+
+
+def _detect_language(text: str) -> str:
+    """
+    Detects if text is Hindi or English based on character ranges.
+    Hindi uses Devanagari script: Unicode range 0900-097F.
+    """
+    hindi_chars = len(_DEVANAGARI.findall(text))
+    ratio = hindi_chars / max(len(text), 1)
+
+    if ratio > 0.3:
+        return "hi-IN"
+    return "en-IN"
+
+
+# Fixed phrases never change language — resolve them once
+_PHRASE_LANGUAGE = {p: _detect_language(p) for p in CACHEABLE_PHRASES}
+
+# Playback-ready PCM (int16 mono) for CACHEABLE_PHRASES, shared by every
+# SarvamTTS in the process and persisted across restarts:
+#   sample rate → {(text, language, speaker) → pcm bytes}
+TTS_CACHE_DIR  = Path(os.getenv("TTS_CACHE_DIR", Path.home() / ".cache" / "voice_agent"))
+_PCM_CACHE: dict = {}
+# asyncio.Lock is bound to the loop that first uses it, so keep one per loop
+_PREWARM_LOCKS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+# One pooled client per event loop — keeps the TLS connection to Sarvam warm
+# across utterances instead of handshaking on every synthesis
+# Its pooled connections belong to the loop that opened them, so a client
+# is never shared across loops
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _get_client() -> httpx.AsyncClient:
+    loop   = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=4)
+        )
+    return client
+
+
+def _prewarm_lock() -> asyncio.Lock:
+    loop = asyncio.get_running_loop()
+    lock = _PREWARM_LOCKS.get(loop)
+    if lock is None:
+        lock = _PREWARM_LOCKS[loop] = asyncio.Lock()
+    return lock
+
 
 class SarvamTTS:
 
     def __init__(self, language: str = DEFAULT_LANGUAGE,
-                 speaker: str = DEFAULT_SPEAKER, timeout: int = 15):
-        self.language = language
-        self.speaker  = speaker
-        self.timeout  = timeout
-        self._cache: dict = {}  # text → audio bytes
+                 speaker: str = DEFAULT_SPEAKER, timeout: int = 15,
+                 sample_rate: int = DEFAULT_SAMPLE_RATE):
+        self.language    = language
+        self.speaker     = speaker
+        self.timeout     = timeout
+        self.sample_rate = sample_rate
+        self._cache: dict = {}  # (text, language, speaker) → audio bytes
 
         if not SARVAM_API_KEY:
             raise ValueError("SARVAM_API_KEY not found in environment.")
 
-    def synthesize(self, text: str, language: str = None) -> bytes:
+    async def synthesize(self, text: str, language: str = None) -> bytes:
         """
         Converts text to speech audio bytes.
         Auto-detects language if not specified.
@@ -57,40 +135,85 @@ class SarvamTTS:
         text = text.strip()
 
         # Auto-detect language from text if not specified
-        lang = language or self._detect_language(text)
+        lang = language or _PHRASE_LANGUAGE.get(text) or _detect_language(text)
 
         # Check cache
-        cache_key = self._make_cache_key(text + lang)
+        cache_key = (text, lang, self.speaker)
         if cache_key in self._cache:
             print(f"[TTS] Cache hit: {text[:40]!r}")
             return self._cache[cache_key]
 
-        audio_bytes = self._call_api(text, lang)
+        audio_bytes = await self._call_api(text, lang)
 
         if text in CACHEABLE_PHRASES and audio_bytes:
             self._cache[cache_key] = audio_bytes
 
         return audio_bytes
 
-    def _detect_language(self, text: str) -> str:
+    # ── Pre-decoded phrase cache ─────────────────────────────────────────────
+
+    def get_pcm(self, text: str, sample_rate: int) -> Optional[bytes]:
+        """
+        Returns ready-to-play PCM for a cacheable phrase, or None.
+        Lets the caller skip synthesis, WAV decoding and resampling.
+        """
+        text = text.strip()
+        lang = _PHRASE_LANGUAGE.get(text)
+        if lang is None:
+            return None
+        return _PCM_CACHE.get(sample_rate, {}).get((text, lang, self.speaker))
+
+    async def prewarm(self, sample_rate: int = 16000) -> None:
         """
-        Detects if text is Hindi or English based on character ranges.
-        Hindi uses Devanagari script: Unicode range 0900-097F.
+        Fills the PCM cache for every CACHEABLE_PHRASE at sample_rate.
+        Loads what a previous process saved to disk, synthesizes only the
+        missing phrases, and writes the result back. Safe to call from
+        every call — after the first run it returns immediately.
         """
-        hindi_chars = sum(1 for c in text if '\u0900' <= c <= '\u097F')
-        ratio = hindi_chars / max(len(text), 1)
+        async with _prewarm_lock():
+            cache = _PCM_CACHE.setdefault(sample_rate, {})
+            path  = TTS_CACHE_DIR / f"tts_pcm_{sample_rate}.json"
+
+            if not cache and path.exists():
+                try:
+                    saved = orjson.loads(path.read_bytes())
+                    cache.update({
+                        (text, lang, speaker): base64.b64decode(pcm)
+                        for text, lang, speaker, pcm in saved
+                    })
+                except Exception as e:
+                    print(f"[TTS] Could not load phrase cache: {e}")
+
+            missing = [
+                (phrase, (phrase, _PHRASE_LANGUAGE[phrase], self.speaker))
+                for phrase in CACHEABLE_PHRASES
+            ]
+            missing = [(phrase, key) for phrase, key in missing if key not in cache]
+            if not missing:
+                return
 
-        if ratio > 0.3:
-            return "hi-IN"
-        return "en-IN"
+            for phrase, key in missing:
+                wav = await self.synthesize(phrase)
+                if wav:
+                    cache[key] = await asyncio.to_thread(wav_to_pcm, wav, sample_rate)
 
-    def synthesize_to_file(self, text: str, output_path: str) -> bool:
+            try:
+                TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(orjson.dumps([
+                    [*key, base64.b64encode(pcm).decode()]
+                    for key, pcm in cache.items()
+                ]))
+                print(f"[TTS] Phrase cache saved: {len(cache)} phrases at {sample_rate}Hz")
+            except Exception as e:
+                print(f"[TTS] Could not save phrase cache: {e}")
+
+    async def synthesize_to_file(self, text: str, output_path: str) -> bool:
         """
         Synthesizes text and saves to a WAV file.
         Returns True on success, False on failure.
         Useful for testing without a live audio stream.
         """
-        audio_bytes = self.synthesize(text)
+        audio_bytes = await self.synthesize(text)
         if not audio_bytes:
             return False
         try:
@@ -102,35 +225,36 @@ class SarvamTTS:
             print(f"[TTS] Failed to save file: {e}")
             return False
 
-    def _call_api(self, text: str, language: str = None) -> bytes:
+    async def _call_api(self, text: str, language: str = None) -> bytes:
         """
         Makes the actual Sarvam TTS API call.
         Returns raw WAV bytes.
         """
         try:
-            from shared.utils.circuit_breaker import sarvam_tts_breaker, CircuitOpenError
-
-            def _call():
-                with httpx.Client(timeout=self.timeout) as client:
-                    return client.post(
-                        SARVAM_TTS_URL,
-                        headers={
-                            "api-subscription-key": SARVAM_API_KEY,
-                            "Content-Type": "application/json",
-                        },
-                        json={
-                            "inputs":               [text],
-                            "target_language_code": language or self.language,
-                            "speaker":              self.speaker,
-                            "model":                "bulbul:v2",
-                            "enable_preprocessing": True,
-                        }
-                    )
-
-            response = sarvam_tts_breaker.call(_call)
+            async def _call():
+                return await _get_client().post(
+                    SARVAM_TTS_URL,
+                    headers={
+                        "api-subscription-key": SARVAM_API_KEY,
+                        "Content-Type": "application/json",
+                    },
+                    json={
+                        "inputs":               [text],
+                        "target_language_code": language or self.language,
+                        "speaker":              self.speaker,
+                        "model":                "bulbul:v2",
+                        "enable_preprocessing": True,
+                        "speech_sample_rate":   self.sample_rate,
+                    },
+                    timeout=self.timeout,
+                )
+
+            response = await sarvam_tts_breaker.acall(_call)
 
             if response.status_code == 200:
-                result = response.json()
+                # Parse the raw bytes — the body is mostly base64 audio, so
+                # skipping the str decode saves a full pass over it
+                result = orjson.loads(response.content)
                 audios = result.get("audios", [])
                 if audios:
                     audio_bytes = base64.b64decode(audios[0])
@@ -147,6 +271,3 @@ class SarvamTTS:
             return b""
 
 
-
-    def _make_cache_key(self, text: str) -> str:
-        return hashlib.md5(f"{text}:{self.language}:{self.speaker}".encode()).hexdigest()
@@ -0,0 +1,144 @@
+# shared/database/bulk_writer.py
+# Batched background inserts for high-volume, non-critical writes.
+# Callers enqueue and return immediately; a daemon thread flushes
+# batches with one bulk_write instead of one insert_one per document.
+#
+# Usage:
+#   outcomes_writer = BulkWriter("call_outcomes")
+#   outcomes_writer.insert({"call_id": ...})
+
+import atexit
+import queue
+import threading
+import time
+
+from pymongo import InsertOne, WriteConcern
+from pymongo.errors import BulkWriteError
+from shared.database.mongo_client import get_db
+from shared.logging.logger import get_logger
+
+logger = get_logger("bulk_writer")
+
+_DUPLICATE_KEY = 11000
+
+
+class BulkWriter:
+
+    def __init__(
+        self,
+        collection:     str,
+        batch_size:     int   = 100,   # flush when this many docs are queued
+        flush_interval: float = 0.2,   # ... or after this many seconds
+        max_attempts:   int   = 3,     # tries per batch before it is dropped
+        retry_backoff:  float = 0.5,   # seconds, multiplied by the attempt number
+    ):
+        self.collection     = collection
+        self.batch_size     = batch_size
+        self.flush_interval = flush_interval
+        self.max_attempts   = max_attempts
+        self.retry_backoff  = retry_backoff
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread             = None
+        self._start_lock         = threading.Lock()
+
+    def insert(self, doc: dict) -> None:
+        """Queues a document for insertion. Never blocks on the network."""
+        if self._thread is None:
+            self._start()
+        self._queue.put(InsertOne(doc))
+
+    def flush(self) -> None:
+        """Synchronously writes everything still queued. Used at exit."""
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write(batch)
+
+    # ── Background thread ─────────────────────────────────────────────────────
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"bulk-writer-{self.collection}", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self) -> None:
+        while True:
+            batch    = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: list) -> None:
+        # Skip the journal wait — these rows are analytics, not orders
+        write_with_retry(
+            get_db(), self.collection, batch,
+            write_concern=WriteConcern(w=1, j=False),
+            max_attempts=self.max_attempts, retry_backoff=self.retry_backoff,
+        )
+
+
+def write_with_retry(
+    db,
+    collection:    str,
+    ops:           list,
+    write_concern: WriteConcern = None,
+    max_attempts:  int   = 3,
+    retry_backoff: float = 0.5,
+) -> bool:
+    """
+    Unordered bulk_write of ops, retrying what failed with a linear backoff.
+    Returns False (and logs the loss) only after max_attempts. Blocking —
+    call it from a worker thread when on an event loop.
+    """
+    error = None
+    for attempt in range(1, max_attempts + 1):
+        try:
+            if write_concern is None:
+                coll = db.get_collection(collection)
+            else:
+                coll = db.get_collection(collection, write_concern=write_concern)
+            coll.bulk_write(ops, ordered=False)
+            return True
+        except BulkWriteError as e:
+            # Unordered: every op not reported here was written. A
+            # duplicate key means an earlier attempt already landed it.
+            ops = [
+                ops[err["index"]]
+                for err in e.details.get("writeErrors", [])
+                if err.get("code") != _DUPLICATE_KEY
+            ]
+            if not ops:
+                return True
+            error = e
+        except Exception as e:
+            error = e
+
+        if attempt < max_attempts:
+            logger.warning(
+                f"[BulkWriter] {collection}: write of {len(ops)} docs failed "
+                f"(attempt {attempt}/{max_attempts}), retrying: {error}"
+            )
+            time.sleep(retry_backoff * attempt)
+
+    logger.error(
+        f"[BulkWriter] {collection}: dropped {len(ops)} docs "
+        f"after {max_attempts} attempts: {error}"
+    )
+    return False
@@ -1,16 +1,52 @@
 # shared/database/mongo_client.py
+# One MongoClient (and connection pool) per process, shared by every service.
+import asyncio
 import os
-from pymongo import MongoClient
+import weakref
+from pymongo import MongoClient, AsyncMongoClient
 from dotenv import load_dotenv
 
-load_dotenv()
-
 _client = None
+# AsyncMongoClient is tied to the event loop it first runs on, so there is
+# one per loop rather than one per process
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMongoClient]" = weakref.WeakKeyDictionary()
+
+
+def _client_options() -> tuple:
+    """
+    Connection settings, read when the first client is built rather than
+    at import — .env is only parsed by processes that actually use Mongo.
+    """
+    load_dotenv()
+    url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+    return url, dict(
+        serverSelectionTimeoutMS=3000,
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        # No idle connections held open unless asked for — short-lived
+        # processes and tests shouldn't open a pool they never use
+        minPoolSize=int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+    )
+
 
 def get_db():
     global _client
     if _client is None:
-        url = os.getenv("MONGO_URL", "mongodb://localhost:27017")
-        _client = MongoClient(url, serverSelectionTimeoutMS=3000)
+        url, options = _client_options()
+        _client = MongoClient(url, **options)
+    db_name = os.getenv("DB_NAME", "ration_agent")
+    return _client[db_name]
+
+
+def get_async_db():
+    """
+    Async counterpart of get_db() for async def handlers.
+    Uses PyMongo's native asyncio client, so it has its own pool.
+    Call it from the event loop that will use the handle.
+    """
+    loop   = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        url, options = _client_options()
+        client = _async_clients[loop] = AsyncMongoClient(url, **options)
     db_name = os.getenv("DB_NAME", "ration_agent")
-    return _client[db_name]
\ No newline at end of file
+    return client[db_name]
@@ -3,50 +3,134 @@
 # Services publish events here. Other services consume them.
 # No direct calls between services — everything goes through this.
 
-import json
+import asyncio
+import atexit
 import os
-from dataclasses import dataclass, field, asdict
+import queue
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Callable, Optional
+from typing import Awaitable, Callable, Optional, Union
 from dotenv import load_dotenv
+import msgspec.msgpack
+import orjson
 import redis
+import redis.asyncio as aioredis
 
-load_dotenv()
+from shared.logging.logger import get_logger
+
+logger = get_logger("event_bus")
 
 # ── Redis connection ──────────────────────────────────────────────────────────
 
+REDIS_MAX_CONNECTIONS = 32
+
 _redis_client: Optional[redis.Redis] = None
+# redis.asyncio connections belong to the loop that opened them, so the
+# async client (and its pool) is kept per event loop
+_async_redis_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = weakref.WeakKeyDictionary()
+_pipelines = threading.local()   # one reusable pipeline per thread
+
+# Bounded pool of kept-alive sockets, health-checked when idle.
+# Raw bytes in and out — event payloads are binary MessagePack.
+_POOL_OPTIONS = dict(
+    max_connections=REDIS_MAX_CONNECTIONS,
+    socket_keepalive=True,
+    health_check_interval=30,
+    decode_responses=False,
+)
+
+def _redis_url() -> str:
+    load_dotenv()  # on first connection, not at import
+    return os.getenv("REDIS_URL", "redis://localhost:6379")
 
 def get_redis() -> redis.Redis:
     global _redis_client
     if _redis_client is None:
-        url = os.getenv("REDIS_URL", "redis://localhost:6379")
-        _redis_client = redis.from_url(url, decode_responses=True)
+        pool = redis.ConnectionPool.from_url(_redis_url(), **_POOL_OPTIONS)
+        _redis_client = redis.Redis(connection_pool=pool)
     return _redis_client
 
+def get_async_redis() -> aioredis.Redis:
+    """
+    asyncio client for aconsume(); same pool settings as get_redis().
+    One per running loop — call it from the loop that will use it.
+    """
+    loop   = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        pool   = aioredis.ConnectionPool.from_url(_redis_url(), **_POOL_OPTIONS)
+        client = _async_redis_clients[loop] = aioredis.Redis(connection_pool=pool)
+    return client
+
+
+def _get_pipeline():
+    # execute() resets a pipeline for reuse, so each thread keeps its own
+    pipe = getattr(_pipelines, "pipe", None)
+    if pipe is None:
+        pipe = _pipelines.pipe = get_redis().pipeline(transaction=False)
+    return pipe
+
 
 # ── Stream config ─────────────────────────────────────────────────────────────
 
 STREAM_NAME   = "agent:events"
-MAX_STREAM_LEN = 10_000  # cap to avoid unbounded memory growth
+STREAM_RETENTION_S = 3600  # entries older than this are trimmed on publish
+
+
+def _trim_minid() -> str:
+    # Stream IDs start with their ms timestamp, so MINID at (now - retention)
+    # drops everything older — bounded by age, not by how bursty producers are
+    return f"{int((time.time() - STREAM_RETENTION_S) * 1000)}-0"
+
+
+# Events travel as MessagePack: smaller than JSON and cheaper to encode and
+# decode. Entries written as JSON before the switch are still readable.
+_ENCODER = msgspec.msgpack.Encoder()
 
 
 # ── Base event ────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class BaseEvent:
     event_type:  str
     call_id:     str
     session_id:  str
-    timestamp:   str = ""
+    # Epoch seconds, UTC. Entries written before the switch to epoch
+    # seconds carry an ISO string — typed so they still decode.
+    timestamp:   Union[float, str] = 0.0
     payload:     dict = field(default_factory=dict)
 
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.utcnow().isoformat()
+            self.timestamp = time.time()
+
+    def serialize(self) -> bytes:
+        # msgspec encodes dataclasses natively — no asdict() deep copy
+        return _ENCODER.encode(self)
 
-    def serialize(self) -> str:
-        return json.dumps(asdict(self))
+
+# Typed decode straight into BaseEvent — no intermediate dict per message
+_DECODER = msgspec.msgpack.Decoder(BaseEvent)
+
+
+def _decode_event(data: bytes) -> BaseEvent:
+    if data[:1] == b"{":       # legacy JSON entry
+        return BaseEvent(**orjson.loads(data))
+    return _DECODER.decode(data)
+
+
+def event_isoformat(event: BaseEvent) -> Optional[str]:
+    """
+    A consumed event's timestamp as a naive-UTC ISO string. Events carry
+    epoch seconds; legacy JSON entries already hold the ISO string.
+    """
+    ts = event.timestamp
+    if not ts or isinstance(ts, str):
+        return ts
+    return datetime.utcfromtimestamp(ts).isoformat()
 
 
 # ── Event types ───────────────────────────────────────────────────────────────
@@ -83,46 +167,171 @@ def publish(event: BaseEvent) -> str:
     msg_id = r.xadd(
         STREAM_NAME,
         {"data": event.serialize()},
-        maxlen=MAX_STREAM_LEN,
+        minid=_trim_minid(),
         approximate=True
+    ).decode()
+    logger.debug(
+        "Published: %s | call=%s | id=%s", event.event_type, event.call_id, msg_id,
+        extra={"call_id": event.call_id, "event_type": event.event_type},
     )
-    print(f"[EventBus] Published: {event.event_type} | call={event.call_id} | id={msg_id}")
     return msg_id
 
 
+def publish_many(events: list) -> list:
+    """
+    Publishes several events in one pipelined round-trip.
+    Returns their message IDs, in order.
+    """
+    pipe  = _get_pipeline()
+    minid = _trim_minid()
+    try:
+        for event in events:
+            pipe.xadd(
+                STREAM_NAME,
+                {"data": event.serialize()},
+                minid=minid,
+                approximate=True
+            )
+        return [msg_id.decode() for msg_id in pipe.execute()]
+    finally:
+        pipe.reset()   # never leave half-queued commands for the next batch
+
+
+# ── Batched async publisher ───────────────────────────────────────────────────
+# publish_async() enqueues and returns immediately. A daemon thread sends
+# queued events in one pipelined round-trip — as soon as PUBLISH_BATCH_SIZE
+# are waiting, or PUBLISH_LINGER_S after the first one, whichever is first.
+
+PUBLISH_BATCH_SIZE = 100
+PUBLISH_LINGER_S   = 0.02
+
+_publish_queue: queue.Queue = queue.Queue()
+_publisher_thread           = None
+_publisher_lock             = threading.Lock()
+
+
+def publish_async(event: BaseEvent) -> None:
+    """
+    Fire-and-forget publish. No message ID is returned; delivery errors
+    are logged by the publisher thread.
+    """
+    if _publisher_thread is None:
+        _start_publisher()
+    _publish_queue.put(event)
+
+
+def flush_published() -> None:
+    """Synchronously sends every event still queued by publish_async()."""
+    batch = []
+    while True:
+        try:
+            batch.append(_publish_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _send_batch(batch)
+
+
+def _start_publisher() -> None:
+    global _publisher_thread
+    with _publisher_lock:
+        if _publisher_thread is not None:
+            return
+        _publisher_thread = threading.Thread(
+            target=_publisher_loop, name="event-bus-publisher", daemon=True
+        )
+        _publisher_thread.start()
+        atexit.register(flush_published)
+
+
+def _publisher_loop() -> None:
+    while True:
+        batch    = [_publish_queue.get()]
+        deadline = time.monotonic() + PUBLISH_LINGER_S
+        while len(batch) < PUBLISH_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_publish_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        _send_batch(batch)
+
+
+def _send_batch(events: list) -> None:
+    try:
+        publish_many(events)
+        logger.debug("Published batch of %d events", len(events))
+    except Exception as e:
+        logger.error("Batch publish failed (%d events): %s", len(events), e)
+
+
 # ── Consumer ──────────────────────────────────────────────────────────────────
 
+def _batch_full(messages, count: int) -> bool:
+    """True if any stream returned a full batch — more is probably waiting."""
+    return any(len(entries) >= count for _, entries in messages or ())
+
+
 def consume(
     consumer_group: str,
     consumer_name:  str,
     event_types:    list,
-    handler:        Callable[[dict], None],
+    handler:        Callable[[BaseEvent], None],
     block_ms:       int = 5000,
     run_once:       bool = False,
+    count:          int = 128,
+    adaptive_block: bool = True,
 ) -> None:
     """
     Blocking consumer. Runs in a loop processing events.
-    Acknowledges each message after handler completes.
+    Acknowledges each batch once its handlers have completed.
     Skips events not in event_types.
 
     Args:
         consumer_group: unique name for this service (e.g. "voice-agent-service")
         consumer_name:  unique name for this instance (e.g. "worker-1")
         event_types:    list of event_type strings to handle (others are skipped)
-        handler:        function that receives event dict and processes it
+        handler:        function that receives the BaseEvent and processes it
         block_ms:       how long to wait for new messages before looping
         run_once:       if True, process pending messages and return (for testing)
+        count:          max entries per XREADGROUP
+        adaptive_block: after a full batch, re-poll without blocking until
+                        the backlog is drained, then park for block_ms again
+    """
+    consume_dispatch(
+        consumer_group, consumer_name, dict.fromkeys(event_types, handler),
+        block_ms=block_ms, run_once=run_once, count=count, adaptive_block=adaptive_block,
+    )
+
+
+def consume_dispatch(
+    consumer_group: str,
+    consumer_name:  str,
+    handlers:       dict,
+    block_ms:       int = 5000,
+    run_once:       bool = False,
+    count:          int = 128,
+    adaptive_block: bool = True,
+) -> None:
+    """
+    consume() with a handler per event type: handlers maps event_type ->
+    function taking the BaseEvent. Event types not in the table are
+    acknowledged and skipped. Other args as for consume().
     """
     r = get_redis()
+    block = block_ms
+    table = dict(handlers)   # private copy — one lookup both filters and dispatches
 
     # Create consumer group if it doesn't exist
     try:
         r.xgroup_create(STREAM_NAME, consumer_group, id="0", mkstream=True)
-        print(f"[EventBus] Created consumer group: {consumer_group}")
+        logger.info("Created consumer group: %s", consumer_group)
     except redis.exceptions.ResponseError:
         pass  # group already exists
 
-    print(f"[EventBus] {consumer_name} listening for: {event_types}")
+    logger.info("%s listening for: %s", consumer_name, list(table))
 
     while True:
         try:
@@ -130,9 +339,12 @@ def consume(
                 consumer_group,
                 consumer_name,
                 {STREAM_NAME: ">"},
-                count=10,
-                block=block_ms,
+                count=count,
+                block=block,
             )
+            # BLOCK 0 would wait forever — None omits BLOCK, returning at once
+            if adaptive_block:
+                block = None if _batch_full(messages, count) else block_ms
 
             if not messages:
                 if run_once:
@@ -140,33 +352,126 @@ def consume(
                 continue
 
             for stream, entries in messages:
-                for msg_id, fields in entries:
-                    try:
-                        event_data = json.loads(fields["data"])
-                        event_type = event_data.get("event_type")
-
-                        # Skip events this consumer doesn't care about
-                        if event_type not in event_types:
-                            r.xack(STREAM_NAME, consumer_group, msg_id)
-                            continue
-
-                        print(f"[EventBus] Received: {event_type} | id={msg_id}")
-                        handler(event_data)
-                        r.xack(STREAM_NAME, consumer_group, msg_id)
-
-                    except Exception as e:
-                        print(f"[EventBus] Handler error: {e} | msg_id={msg_id}")
-                        # Acknowledge anyway to avoid blocking the stream
-                        r.xack(STREAM_NAME, consumer_group, msg_id)
+                # Every entry is acknowledged — handled, skipped or failed —
+                # so collect the IDs and ack the whole batch in one call
+                ack_ids = []
+                try:
+                    for msg_id, fields in entries:
+                        try:
+                            event      = _decode_event(fields[b"data"])
+                            event_type = event.event_type
+
+                            # Events this consumer doesn't care about are just acked
+                            fn = table.get(event_type)
+                            if fn is not None:
+                                logger.debug("Received: %s | id=%s", event_type, msg_id.decode(),
+                                             extra={"event_type": event_type})
+                                fn(event)
+
+                        except Exception as e:
+                            logger.warning("Handler error: %s | msg_id=%s", e, msg_id.decode())
+                            # Acknowledge anyway to avoid blocking the stream
+                        ack_ids.append(msg_id)
+                finally:
+                    if ack_ids:
+                        r.xack(STREAM_NAME, consumer_group, *ack_ids)
 
             if run_once:
                 break
 
         except KeyboardInterrupt:
-            print(f"\n[EventBus] {consumer_name} shutting down.")
+            logger.info("%s shutting down.", consumer_name)
             break
         except Exception as e:
-            print(f"[EventBus] Consumer error: {e}")
+            logger.error("Consumer error: %s", e)
+            if run_once:
+                break
+
+
+async def aconsume(
+    consumer_group: str,
+    consumer_name:  str,
+    event_types:    Union[list, dict],
+    handler:        Callable[[BaseEvent], Awaitable[None]],
+    block_ms:       int = 5000,
+    run_once:       bool = False,
+    count:          int = 128,
+    adaptive_block: bool = True,
+) -> None:
+    """
+    asyncio counterpart of consume(). One XREADGROUP covers every stream,
+    so a single event loop can serve several streams without a thread each.
+
+    Args:
+        event_types: list of event types on STREAM_NAME, or a dict mapping
+                     stream name -> list of event types to handle there
+        handler:     coroutine function that receives the BaseEvent
+        count:       max entries read per stream per call
+        (other args as for consume())
+    """
+    if not isinstance(event_types, dict):
+        event_types = {STREAM_NAME: event_types}
+    r = get_async_redis()
+
+    for stream in event_types:
+        try:
+            await r.xgroup_create(stream, consumer_group, id="0", mkstream=True)
+            logger.info("Created consumer group: %s on %s", consumer_group, stream)
+        except redis.exceptions.ResponseError:
+            pass  # group already exists
+
+    logger.info("%s listening for: %s", consumer_name, event_types)
+    streams = {stream: ">" for stream in event_types}
+    wanted  = {stream: frozenset(types) for stream, types in event_types.items()}
+    block   = block_ms
+
+    while True:
+        try:
+            messages = await r.xreadgroup(
+                consumer_group, consumer_name, streams, count=count, block=block,
+            )
+            if adaptive_block:
+                block = None if _batch_full(messages, count) else block_ms
+
+            if not messages:
+                if run_once:
+                    break
+                continue
+
+            # Same ack policy as consume(): every finished entry is acked,
+            # all streams' acks going out in one pipelined round-trip
+            acks = {}
+            try:
+                for stream, entries in messages:
+                    stream = stream.decode()
+                    types  = wanted.get(stream, frozenset())
+                    ids    = acks.setdefault(stream, [])
+                    for msg_id, fields in entries:
+                        try:
+                            event      = _decode_event(fields[b"data"])
+                            event_type = event.event_type
+                            if event_type in types:
+                                logger.debug("Received: %s | id=%s", event_type, msg_id.decode(),
+                                             extra={"event_type": event_type})
+                                await handler(event)
+                        except Exception as e:
+                            logger.warning("Handler error: %s | msg_id=%s", e, msg_id.decode())
+                        ids.append(msg_id)
+            finally:
+                if any(acks.values()):
+                    async with r.pipeline(transaction=False) as pipe:
+                        for stream, ids in acks.items():
+                            if ids:
+                                pipe.xack(stream, consumer_group, *ids)
+                        await pipe.execute()
+
             if run_once:
                 break
 
+        except asyncio.CancelledError:
+            logger.info("%s shutting down.", consumer_name)
+            raise
+        except Exception as e:
+            logger.error("Consumer error: %s", e)
+            if run_once:
+                break
@@ -3,9 +3,29 @@
 # Every log line is valid JSON — queryable by Grafana/CloudWatch.
 
 import logging
-import json
 import os
-from datetime import datetime
+import time
+
+import orjson
+
+# Extra fields copied onto the JSON line when the caller passes them
+_EXTRA_KEYS = ("call_id", "session_id", "event_type",
+               "latency_ms", "intent", "outcome", "order_id")
+
+
+# (whole second, "YYYY-MM-DDTHH:MM:SS") — the date/time part only changes
+# once a second, so it's formatted once and reused for every line in it
+_ts_prefix = (None, "")
+
+
+def _iso_utc(t: float) -> str:
+    """Epoch seconds -> naive-UTC ISO string, same shape as utcnow().isoformat()."""
+    global _ts_prefix
+    sec    = int(t)
+    cached = _ts_prefix   # read once — another logging thread may swap it
+    if cached[0] != sec:
+        cached = _ts_prefix = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+    return f"{cached[1]}.{int((t - sec) * 1e6):06d}"
 
 
 class StructuredFormatter(logging.Formatter):
@@ -15,22 +35,24 @@ class StructuredFormatter(logging.Formatter):
     """
     def format(self, record: logging.LogRecord) -> str:
         log = {
-            "ts":      datetime.utcnow().isoformat(),
+            "ts":      _iso_utc(record.created),
             "level":   record.levelname,
             "service": record.name,
             "message": record.getMessage(),
         }
-        # Attach any extra fields passed by the caller
-        for key in ("call_id", "session_id", "event_type",
-                    "latency_ms", "intent", "outcome", "order_id"):
-            if hasattr(record, key):
-                log[key] = getattr(record, key)
+        # Attach any extra fields passed by the caller — extra= lands in the
+        # record's __dict__, so plain dict lookups replace hasattr/getattr
+        rd = record.__dict__
+        for key in _EXTRA_KEYS:
+            if key in rd:
+                log[key] = rd[key]
 
         # Attach exception info if present
         if record.exc_info:
             log["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log, ensure_ascii=False)
+        # orjson always emits UTF-8; unknown extra types fall back to str()
+        return orjson.dumps(log, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 def get_logger(name: str) -> logging.Logger:
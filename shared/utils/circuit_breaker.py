@@ -10,12 +10,25 @@
 #       ...
 
 import time
+from enum import IntEnum
 from functools import wraps
+from threading import Lock
 from shared.logging.logger import get_logger
 
 logger = get_logger("circuit_breaker")
 
 
+class BreakerState(IntEnum):
+    CLOSED    = 0
+    OPEN      = 1
+    HALF_OPEN = 2
+
+
+# Bound at module level — looking members up on the enum class is several
+# times slower than the comparison itself
+_CLOSED, _OPEN, _HALF_OPEN = BreakerState.CLOSED, BreakerState.OPEN, BreakerState.HALF_OPEN
+
+
 class CircuitOpenError(Exception):
     """Raised when circuit is OPEN and call is blocked."""
     pass
@@ -42,49 +55,60 @@ class CircuitBreaker:
         self.recovery_timeout  = recovery_timeout
         self.success_threshold = success_threshold
 
-        self._state            = "CLOSED"
+        self._state            = _CLOSED
         self._failure_count    = 0
         self._success_count    = 0
-        self._last_failure_ts  = None
+        self._last_failure_ts  = None   # time.monotonic() — immune to clock jumps
+        self._lock             = Lock()  # guards transitions; reads stay lock-free
 
     # ── State checks ──────────────────────────────────────────────────────────
 
     @property
     def state(self) -> str:
-        if self._state == "OPEN":
-            # Check if recovery timeout has passed
-            if time.time() - self._last_failure_ts >= self.recovery_timeout:
-                self._state         = "HALF_OPEN"
+        """Current state name: "CLOSED", "OPEN" or "HALF_OPEN"."""
+        return self._current().name
+
+    def _current(self) -> BreakerState:
+        if self._state is not _OPEN:
+            return self._state
+        with self._lock:
+            # Re-check under the lock — another thread may have flipped it
+            if (self._state is _OPEN
+                    and time.monotonic() - self._last_failure_ts >= self.recovery_timeout):
+                self._state         = _HALF_OPEN
                 self._success_count = 0
-                logger.info(f"Circuit [{self.name}] → HALF_OPEN (testing recovery)")
-        return self._state
+                logger.info("Circuit [%s] → HALF_OPEN (testing recovery)", self.name)
+            return self._state
 
     def is_available(self) -> bool:
-        return self.state != "OPEN"
+        return self._state is not _OPEN or self._current() is not _OPEN
 
     # ── Call tracking ─────────────────────────────────────────────────────────
 
     def record_success(self):
-        if self._state == "HALF_OPEN":
-            self._success_count += 1
-            if self._success_count >= self.success_threshold:
-                self._state         = "CLOSED"
-                self._failure_count = 0
-                logger.info(f"Circuit [{self.name}] → CLOSED (recovered)")
-        elif self._state == "CLOSED":
-            self._failure_count = 0  # reset on success
+        if self._state is _CLOSED and not self._failure_count:
+            return  # healthy steady state — nothing to update
+        with self._lock:
+            if self._state is _HALF_OPEN:
+                self._success_count += 1
+                if self._success_count >= self.success_threshold:
+                    self._state         = _CLOSED
+                    self._failure_count = 0
+                    logger.info("Circuit [%s] → CLOSED (recovered)", self.name)
+            elif self._state is _CLOSED:
+                self._failure_count = 0  # reset on success
 
     def record_failure(self):
-        self._failure_count   += 1
-        self._last_failure_ts  = time.time()
-
-        if self._failure_count >= self.failure_threshold:
-            self._state = "OPEN"
-            logger.warning(
-                f"Circuit [{self.name}] → OPEN "
-                f"({self._failure_count} failures, "
-                f"blocking for {self.recovery_timeout}s)"
-            )
+        with self._lock:
+            self._failure_count   += 1
+            self._last_failure_ts  = time.monotonic()
+
+            if self._failure_count >= self.failure_threshold:
+                self._state = _OPEN
+                logger.warning(
+                    "Circuit [%s] → OPEN (%d failures, blocking for %ss)",
+                    self.name, self._failure_count, self.recovery_timeout,
+                )
 
     # ── Decorator interface ───────────────────────────────────────────────────
 
@@ -123,10 +147,26 @@ class CircuitBreaker:
             self.record_failure()
             raise
 
+    async def acall(self, func, *args, **kwargs):
+        """Async variant of call() — awaits func(*args, **kwargs)."""
+        if not self.is_available():
+            raise CircuitOpenError(
+                f"Circuit [{self.name}] is OPEN — service unavailable."
+            )
+        try:
+            result = await func(*args, **kwargs)
+            self.record_success()
+            return result
+        except CircuitOpenError:
+            raise
+        except Exception as e:
+            self.record_failure()
+            raise
+
     def __repr__(self):
         return (
             f"CircuitBreaker(name={self.name!r}, "
-            f"state={self._state}, "
+            f"state={self._state.name}, "
             f"failures={self._failure_count})"
         )
 
@@ -3,7 +3,7 @@
 # Prevents quota exhaustion on Gemini and Sarvam APIs.
 
 import time
-from threading import Lock
+from threading import Condition
 from shared.logging.logger import get_logger
 
 logger = get_logger("rate_limiter")
@@ -33,14 +33,18 @@ class RateLimiter:
         self.max_tokens  = max_tokens
         self.refill_rate = refill_rate
         self._tokens     = float(max_tokens)
-        self._last_refill = time.time()
-        self._lock       = Lock()
+        self._last_refill = time.monotonic()
+        self._cv         = Condition()   # also the lock for acquire()
 
-    def _refill(self):
-        now     = time.time()
-        elapsed = now - self._last_refill
-        added   = elapsed * self.refill_rate
-        self._tokens      = min(self.max_tokens, self._tokens + added)
+    def _refill(self, now: float):
+        # Caller holds the lock. `now` was read before it was taken, so a
+        # thread that got in first may already have refilled past it.
+        if now <= self._last_refill:
+            return
+        # A full bucket has nothing to add
+        if self._tokens < self.max_tokens:
+            added        = (now - self._last_refill) * self.refill_rate
+            self._tokens = min(self.max_tokens, self._tokens + added)
         self._last_refill = now
 
     def acquire(self, tokens: int = 1) -> bool:
@@ -48,14 +52,15 @@ class RateLimiter:
         Try to acquire tokens. Returns True if allowed, False if rate limited.
         Non-blocking — never waits.
         """
-        with self._lock:
-            self._refill()
+        now = time.monotonic()   # read the clock before taking the lock
+        with self._cv:
+            self._refill(now)
             if self._tokens >= tokens:
                 self._tokens -= tokens
                 return True
             logger.warning(
-                f"Rate limited [{self.name}] — "
-                f"{self._tokens:.1f} tokens available, {tokens} needed"
+                "Rate limited [%s] — %.1f tokens available, %d needed",
+                self.name, self._tokens, tokens,
             )
             return False
 
@@ -64,12 +69,23 @@ class RateLimiter:
         Blocking version — waits up to timeout seconds.
         Returns True if acquired, False if timed out.
         """
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            if self.acquire(tokens):
-                return True
-            time.sleep(0.1)
-        return False
+        deadline = time.monotonic() + timeout
+        with self._cv:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return True
+                remaining = deadline - now
+                if remaining <= 0:
+                    return False
+                # Only time adds tokens, so sleep until exactly enough have
+                # refilled (or the deadline) — wait() releases the lock meanwhile
+                needed = remaining
+                if self.refill_rate > 0:
+                    needed = (tokens - self._tokens) / self.refill_rate
+                self._cv.wait(min(needed, remaining))
 
     def __repr__(self):
         return (
@@ -2,6 +2,7 @@
 import asyncio
 import sys
 import os
+import time
 from datetime import datetime
 
 sys.path.insert(0, '.')
@@ -9,6 +10,23 @@ sys.path.insert(0, '.')
 from shared.events.event_bus import publish, CallEndedEvent
 from shared.database.mongo_client import get_db
 
+# The classifier and retry engine buffer their writes (BulkWriter) and
+# events (publish_async), so there's no fixed delay after which the docs
+# are guaranteed to exist — poll for them instead.
+WAIT_TIMEOUT_S = 10.0
+# How long a doc that should NOT appear gets to show up anyway
+ABSENT_GRACE_S = 3.0
+
+
+async def wait_for(find, timeout: float = WAIT_TIMEOUT_S, interval: float = 0.1):
+    """Polls find() until it returns a document, or None once timeout passes."""
+    deadline = time.monotonic() + timeout
+    while True:
+        doc = find()
+        if doc is not None or time.monotonic() >= deadline:
+            return doc
+        await asyncio.sleep(interval)
+
 
 async def test_feedback_loop():
     print("=" * 60)
@@ -33,10 +51,11 @@ async def test_feedback_loop():
         }
     ))
     
-    await asyncio.sleep(2)
-    
-    outcome = db.call_outcomes.find_one({"call_id": "test_success_001"})
-    retry = db.retry_queue.find_one({"session_id": "test_session_success"})
+    outcome = await wait_for(lambda: db.call_outcomes.find_one({"call_id": "test_success_001"}))
+    retry = await wait_for(
+        lambda: db.retry_queue.find_one({"session_id": "test_session_success"}),
+        timeout=ABSENT_GRACE_S,
+    )
     
     print(f"Outcome saved: {outcome is not None}")
     print(f"Retry scheduled: {retry is not None}")
@@ -63,10 +82,8 @@ async def test_feedback_loop():
         }
     ))
     
-    await asyncio.sleep(2)
-    
-    outcome = db.call_outcomes.find_one({"call_id": "test_timeout_001"})
-    retry = db.retry_queue.find_one({"session_id": "test_session_timeout"})
+    outcome = await wait_for(lambda: db.call_outcomes.find_one({"call_id": "test_timeout_001"}))
+    retry = await wait_for(lambda: db.retry_queue.find_one({"session_id": "test_session_timeout"}))
     
     print(f"Outcome saved: {outcome is not None}")
     print(f"Retry scheduled: {retry is not None}")
@@ -0,0 +1,13 @@
+# tests/conftest.py
+# The services import each other the way they do at runtime: the repo root
+# for shared/, constants and item_parser, and services/voice_agent for the
+# agent modules (memory_manager, conversation_state, ...).
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+for path in (ROOT, ROOT / "services" / "voice_agent"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
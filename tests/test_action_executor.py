@@ -0,0 +1,87 @@
+# tests/test_action_executor.py
+# Reply cache for LLM-backed turns: which intents use it and how it's keyed.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import action_executor
+from action_executor import collect_response, execute
+from conversation_state import ConversationState
+
+
+class _FakeGroq:
+    """Streams a numbered reply per call and counts the calls."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat  = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **kwargs):
+        self.calls += 1
+        reply = f"reply {self.calls}."
+
+        async def stream():
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=reply))])
+        return stream()
+
+
+@pytest.fixture
+def groq(monkeypatch):
+    fake = _FakeGroq()
+    monkeypatch.setattr(action_executor, "_groq_pool", lambda: action_executor._GroqPool(fake, None))
+    monkeypatch.setattr(action_executor, "_RESPONSE_CACHE", type(action_executor._RESPONSE_CACHE)())
+    return fake
+
+
+def _say(intent: str, text: str, state: ConversationState) -> str:
+    result = SimpleNamespace(intent=intent, raw_text=text, llm_used=False)
+    return asyncio.run(_run(result, state))
+
+
+async def _run(result, state):
+    return await collect_response(await execute(result, state))
+
+
+def test_greeting_reply_is_cached(groq):
+    first  = _say("greeting", "Hello", ConversationState(session_id="a"))
+    second = _say("greeting", "  hello ", ConversationState(session_id="b"))
+    assert first == second == "reply 1."
+    assert groq.calls == 1
+
+
+def test_clarify_is_never_cached(groq):
+    _say("clarify", "what is this", ConversationState(session_id="a"))
+    _say("clarify", "what is this", ConversationState(session_id="b"))
+    assert groq.calls == 2
+
+
+def test_cache_key_uses_the_full_utterance(groq):
+    prefix = "okay " * 13                    # 65 chars — longer than the old key
+    _say("acknowledgement", prefix + "sure", ConversationState(session_id="a"))
+    _say("acknowledgement", prefix + "fine", ConversationState(session_id="b"))
+    assert groq.calls == 2
+
+
+def test_non_empty_cart_bypasses_cache(groq):
+    state = ConversationState(session_id="a")
+    state.items_by_name["rice"] = {"name": "rice", "quantity": 1, "unit": "kg"}
+    _say("greeting", "hello", state)
+    _say("greeting", "hello", state)
+    assert groq.calls == 2
+
+
+def test_groq_client_is_per_event_loop(monkeypatch):
+    pytest.importorskip("groq")
+    monkeypatch.setattr(action_executor, "_GROQ_POOLS", type(action_executor._GROQ_POOLS)())
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+
+    async def pools():
+        return action_executor._groq_pool(), action_executor._groq_pool()
+
+    first, same = asyncio.run(pools())
+    second, _   = asyncio.run(pools())
+    assert first is same
+    assert first.client is not second.client
+    assert first.http is not second.http
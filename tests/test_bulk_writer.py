@@ -0,0 +1,64 @@
+# tests/test_bulk_writer.py
+# Failed batches are retried, not dropped on the first error.
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+from shared.database import bulk_writer
+from shared.database.bulk_writer import BulkWriter
+
+
+class _Collection:
+    """Fails the first len(failures) bulk_writes with the queued errors."""
+
+    def __init__(self, failures=()):
+        self.failures = list(failures)
+        self.calls    = []
+
+    def bulk_write(self, ops, ordered=True):
+        self.calls.append([op._doc["n"] for op in ops])
+        if self.failures:
+            raise self.failures.pop(0)
+
+
+@pytest.fixture
+def coll(monkeypatch):
+    fake = _Collection()
+
+    class _DB:
+        def get_collection(self, name, write_concern=None):
+            return fake
+    monkeypatch.setattr(bulk_writer, "get_db", lambda: _DB())
+    return fake
+
+
+def _writer(**kwargs) -> BulkWriter:
+    return BulkWriter("retry_queue", retry_backoff=0, **kwargs)
+
+
+def _ops(*ns):
+    return [bulk_writer.InsertOne({"n": n}) for n in ns]
+
+
+def test_transient_failure_is_retried(coll):
+    coll.failures = [AutoReconnect("primary stepped down")]
+    _writer()._write(_ops(1, 2))
+    assert coll.calls == [[1, 2], [1, 2]]
+
+
+def test_partial_failure_retries_only_failed_ops(coll):
+    coll.failures = [BulkWriteError({"writeErrors": [
+        {"index": 1, "code": 91, "errmsg": "shutdown in progress"},
+        {"index": 2, "code": 11000, "errmsg": "duplicate key"},
+    ]})]
+    _writer()._write(_ops(1, 2, 3))
+    assert coll.calls == [[1, 2, 3], [2]]
+
+
+def test_gives_up_after_max_attempts(coll):
+    coll.failures = [AutoReconnect("down")] * 5
+    _writer(max_attempts=3)._write(_ops(1))
+    assert len(coll.calls) == 3
@@ -0,0 +1,88 @@
+# tests/test_circuit_breaker.py
+# CLOSED → OPEN → HALF_OPEN → CLOSED transitions, on a controlled clock.
+
+import asyncio
+
+import pytest
+
+from shared.utils import circuit_breaker
+from shared.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("test", failure_threshold=3, recovery_timeout=30, success_threshold=2)
+
+
+def _fail():
+    raise ValueError("upstream down")
+
+
+def test_opens_after_threshold_failures(breaker):
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            breaker.call(_fail)
+    assert breaker.state == "CLOSED"
+
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    assert breaker.state == "OPEN"
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: "ok")
+
+
+def test_success_resets_failure_count(breaker):
+    for _ in range(2):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "CLOSED"
+
+
+def test_half_open_after_timeout_then_closes(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 29
+    assert not breaker.is_available()
+
+    clock[0] += 1
+    assert breaker.state == "HALF_OPEN"
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == "HALF_OPEN"      # needs success_threshold successes
+    breaker.call(lambda: "ok")
+    assert breaker.state == "CLOSED"
+
+
+def test_failure_in_half_open_reopens(breaker, clock):
+    for _ in range(3):
+        breaker.record_failure()
+    clock[0] += 30
+    assert breaker.state == "HALF_OPEN"
+
+    with pytest.raises(ValueError):
+        breaker.call(_fail)
+    assert breaker.state == "OPEN"
+
+
+def test_decorator_and_acall_track_the_same_state(breaker):
+    @breaker
+    def guarded():
+        _fail()
+
+    async def afail():
+        _fail()
+
+    with pytest.raises(ValueError):
+        guarded()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            asyncio.run(breaker.acall(afail))
+    with pytest.raises(CircuitOpenError):
+        guarded()
@@ -0,0 +1,70 @@
+# tests/test_event_bus.py
+# Stream entries decode into BaseEvent whatever format wrote them, and the
+# asyncio client is never shared across event loops.
+
+import asyncio
+
+import msgspec.msgpack
+import orjson
+
+from shared.events.event_bus import (
+    BaseEvent, CallEndedEvent, _decode_event, event_isoformat,
+)
+
+
+def test_msgpack_round_trip():
+    event = CallEndedEvent("c1", "s1", payload={"outcome": "completed", "turn_count": 5})
+    decoded = _decode_event(event.serialize())
+    assert decoded == event
+    assert isinstance(decoded.timestamp, float)
+
+
+def test_timestamp_defaults_to_now_and_formats_as_utc():
+    event = BaseEvent("call.ended", "c1", "s1", timestamp=1767323045.000006)
+    assert event_isoformat(event) == "2026-01-02T03:04:05.000006"
+    assert BaseEvent("call.ended", "c1", "s1").timestamp > 0
+
+
+def test_legacy_json_entry_decodes():
+    # Entries published as JSON, before the switch to msgpack
+    data = orjson.dumps({
+        "event_type": "call.ended",
+        "call_id":    "c1",
+        "session_id": "s1",
+        "timestamp":  "2026-01-02T03:04:05.000006",
+        "payload":    {"outcome": "silence_timeout"},
+    })
+    event = _decode_event(data)
+    assert event.event_type == "call.ended"
+    assert event.payload == {"outcome": "silence_timeout"}
+    assert event_isoformat(event) == "2026-01-02T03:04:05.000006"
+
+
+def test_msgpack_entry_with_iso_timestamp_decodes():
+    # msgpack entries written while timestamps were still ISO strings
+    data = msgspec.msgpack.encode({
+        "event_type": "call.completed",
+        "call_id":    "c1",
+        "session_id": "s1",
+        "timestamp":  "2026-01-02T03:04:05.000006",
+        "payload":    {"outcome": "ordered"},
+    })
+    event = _decode_event(data)
+    assert event.timestamp == "2026-01-02T03:04:05.000006"
+    assert event_isoformat(event) == "2026-01-02T03:04:05.000006"
+    assert event.payload == {"outcome": "ordered"}
+
+
+def test_async_redis_client_is_per_event_loop(monkeypatch):
+    from shared.events import event_bus
+    monkeypatch.setattr(event_bus, "_async_redis_clients", type(event_bus._async_redis_clients)())
+    monkeypatch.setattr(event_bus, "load_dotenv", lambda: None)
+
+    async def clients():
+        return event_bus.get_async_redis(), event_bus.get_async_redis()
+
+    first, same = asyncio.run(clients())
+    second, _   = asyncio.run(clients())
+    assert first is same
+    assert first is not second
+    assert first.connection_pool is not second.connection_pool
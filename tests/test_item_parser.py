@@ -0,0 +1,70 @@
+# tests/test_item_parser.py
+# parse_item against results recorded from the parser before its regexes
+# were precompiled, fused and memoised — the rewrite must not change a parse.
+
+import pytest
+
+from item_parser import parse_item, parse_items_batch
+
+GOLDEN = [
+    ('5 kg rice', "ParseResult(name='rice', qty=5.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('5kg rice', "ParseResult(name='rice', qty=5.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('5 kilograms of rice', "ParseResult(name='rice', qty=5.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('rice 5 kg', "ParseResult(name='rice', qty=5.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('rice 5kg', "ParseResult(name='rice', qty=5.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('5 kg', "ParseResult(name=None, qty=5.0, unit='kg', accum=False, update=False, conf='medium')"),
+    ('rice 5', "ParseResult(name='rice', qty=5.0, unit=None, accum=False, update=False, conf='medium')"),
+    ('two kg sugar', "ParseResult(name='sugar', qty=2.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('half litre oil', "ParseResult(name='oil', qty=0.5, unit='litre', accum=False, update=False, conf='high')"),
+    ('add 3 packets of maggi', "ParseResult(name='maggi', qty=3.0, unit='packet', accum=False, update=False, conf='medium')"),
+    ('I want some more dal', "ParseResult(name='dal', qty=None, unit=None, accum=True, update=False, conf='medium')"),
+    ('change rice to 10 kg', "ParseResult(name='change', qty=10.0, unit='kg', accum=False, update=True, conf='medium')"),
+    ('yes', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('no', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('ok', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('bye', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('show cart', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('  Rice   FIVE  KG ', "ParseResult(name='rice', qty=5.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('1.5 ltr milk', "ParseResult(name='milk', qty=1.5, unit='litre', accum=False, update=False, conf='high')"),
+    ('dal', "ParseResult(name='dal', qty=None, unit=None, accum=False, update=False, conf='medium')"),
+    ('pepper 2 dozen', "ParseResult(name='pepper', qty=2.0, unit='dozen', accum=False, update=False, conf='high')"),
+    ('give me 10 bags of atta please', "ParseResult(name='atta', qty=10.0, unit='bag', accum=False, update=False, conf='high')"),
+    ('update', "ParseResult(name=None, qty=None, unit=None, accum=False, update=True, conf='none')"),
+    ('I need tomato', "ParseResult(name='tomato', qty=None, unit=None, accum=False, update=False, conf='medium')"),
+    ('xyz', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('   ', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('0 kg rice', "ParseResult(name='rice', qty=None, unit='kg', accum=False, update=False, conf='medium')"),
+    ('99999 kg rice', "ParseResult(name='rice', qty=None, unit='kg', accum=False, update=False, conf='medium')"),
+    ('one two three', "ParseResult(name=None, qty=1.0, unit=None, accum=False, update=False, conf='medium')"),
+    ('quarter kg ghee', "ParseResult(name='ghee', qty=0.25, unit='kg', accum=False, update=False, conf='high')"),
+    ('something', "ParseResult(name=None, qty=None, unit=None, accum=False, update=False, conf='none')"),
+    ('correct it to 4 kg', "ParseResult(name='correct', qty=4.0, unit='kg', accum=False, update=True, conf='medium')"),
+    ('buy 2 pc bread', "ParseResult(name='bread', qty=2.0, unit='piece', accum=False, update=False, conf='high')"),
+    ('3 l oil', "ParseResult(name='oil', qty=3.0, unit='litre', accum=False, update=False, conf='high')"),
+    ('milk 2 l', "ParseResult(name='milk', qty=2.0, unit='litre', accum=False, update=False, conf='high')"),
+    ('need 12 g salt', "ParseResult(name='salt', qty=12.0, unit='g', accum=False, update=False, conf='high')"),
+    ('tea', "ParseResult(name='tea', qty=None, unit=None, accum=False, update=False, conf='medium')"),
+    ('coffee 500 g', "ParseResult(name='coffee', qty=500.0, unit='g', accum=False, update=False, conf='high')"),
+    ('kilo onion 3', "ParseResult(name='onion', qty=3.0, unit='kg', accum=False, update=False, conf='high')"),
+    ('हिंदी चावल 5 kg', "ParseResult(name=None, qty=5.0, unit='kg', accum=False, update=False, conf='medium')"),
+    ('sugar 2.5', "ParseResult(name='sugar', qty=2.5, unit=None, accum=False, update=False, conf='medium')"),
+    ('Half kg Tea and 2 kg sugar', "ParseResult(name='tea', qty=0.5, unit='kg', accum=False, update=False, conf='high')"),
+]
+
+
+@pytest.mark.parametrize("text, expected", GOLDEN)
+def test_parse_matches_golden(text, expected):
+    assert repr(parse_item(text)) == expected
+
+
+def test_cached_parse_returns_fresh_result():
+    first = parse_item("5 kg rice")
+    first.quantity = 99
+    assert parse_item("5 kg rice").quantity == 5.0
+    assert parse_item("  5 KG Rice ") is not parse_item("5 kg rice")
+
+
+def test_batch_matches_single_parses():
+    texts = [text for text, _ in GOLDEN] * 2
+    assert [repr(r) for r in parse_items_batch(texts)] == [repr(parse_item(t)) for t in texts]
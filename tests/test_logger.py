@@ -0,0 +1,29 @@
+# tests/test_logger.py
+# The cached date/time prefix must always belong to the line's own second.
+
+from datetime import datetime
+
+from shared.logging import logger
+
+
+def _expected(t: float) -> str:
+    return datetime.utcfromtimestamp(t).isoformat(timespec="microseconds")
+
+
+def test_iso_utc_matches_datetime():
+    for t in (0.0, 1767323045.125, 1767323045.5, 1767323046.25):
+        assert logger._iso_utc(t) == _expected(t)
+
+
+def test_prefix_swapped_by_another_thread_mid_call(monkeypatch):
+    t = 1767323045.5
+
+    class _Racy(tuple):
+        # Another thread logs a different second right after our check
+        def __getitem__(self, i):
+            value = tuple.__getitem__(self, i)
+            logger._ts_prefix = (0, "1970-01-01T00:00:00")
+            return value
+
+    monkeypatch.setattr(logger, "_ts_prefix", _Racy((int(t), _expected(t)[:19])))
+    assert logger._iso_utc(t) == _expected(t)
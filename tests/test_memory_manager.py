@@ -0,0 +1,116 @@
+# tests/test_memory_manager.py
+# Session cache bounds: LRU size cap, idle TTL, and concurrent access.
+
+import sys
+import threading
+
+import pytest
+
+import memory_manager
+from memory_manager import MemoryManager
+
+
+@pytest.fixture
+def manager():
+    m = MemoryManager()
+    m._db = False          # memory-only mode — never touches MongoDB
+    return m
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memory_manager.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_evicts_least_recently_used_over_size_cap(manager, monkeypatch):
+    monkeypatch.setattr(memory_manager, "SESSION_CACHE_MAX_SIZE", 2)
+
+    a = manager.get_session("a")
+    manager.get_session("b")
+    manager.get_session("a")          # "a" is now most recent
+    manager.get_session("c")          # over the cap — "b" goes
+
+    assert list(manager._cache) == ["a", "c"]
+    assert manager.get_session("a") is a
+    assert "b" not in manager._touched
+
+
+def test_idle_sessions_expire_after_ttl(manager, monkeypatch, clock):
+    monkeypatch.setattr(memory_manager, "SESSION_CACHE_TTL_S", 10)
+
+    old = manager.get_session("old")
+    clock[0] += 5
+    manager.get_session("fresh")
+    clock[0] += 6                      # "old" idle 11s, "fresh" idle 6s
+    manager.get_session("other")
+
+    assert "old" not in manager._cache
+    assert "fresh" in manager._cache
+    assert manager.get_session("old") is not old   # reloaded as fresh state
+
+
+def test_concurrent_access_never_raises(manager, monkeypatch):
+    monkeypatch.setattr(memory_manager, "SESSION_CACHE_MAX_SIZE", 5)
+    errors = []
+
+    def worker(n):
+        try:
+            for i in range(500):
+                state = manager.get_session(f"s{(n * 7 + i) % 40}")
+                manager.save_session(state)
+        except Exception as e:           # pragma: no cover — the failure case
+            errors.append(e)
+
+    # Switch threads as often as possible so evictions interleave
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    assert errors == []
+    assert len(manager._cache) <= 5
+
+
+class _Sessions:
+    """update_one that lets a test run code while the write is in flight."""
+
+    def __init__(self):
+        self.during_write = lambda: None
+
+    def find_one(self, query):
+        return None
+
+    def update_one(self, query, update, upsert=False):
+        self.during_write()
+
+
+def test_write_for_evicted_session_leaves_no_snapshot(monkeypatch):
+    monkeypatch.setattr(memory_manager, "SESSION_CACHE_MAX_SIZE", 1)
+    sessions = _Sessions()
+    manager  = MemoryManager()
+    manager._db = type("_DB", (), {"sessions": sessions})()
+
+    a = manager.get_session("a")
+    # Another thread loads "b" mid-write, evicting "a" over the size cap
+    sessions.during_write = lambda: manager.get_session("b")
+    manager.save_session(a)
+
+    assert "a" not in manager._cache
+    assert "a" not in manager._persisted
+
+
+def test_write_records_snapshot_for_cached_session():
+    manager = MemoryManager()
+    manager._db = type("_DB", (), {"sessions": _Sessions()})()
+
+    state = manager.get_session("a")
+    manager.save_session(state)
+    assert manager._persisted["a"]["session_id"] == "a"
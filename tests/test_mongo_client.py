@@ -0,0 +1,33 @@
+# tests/test_mongo_client.py
+# Client construction only — nothing here connects to MongoDB.
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from shared.database import mongo_client
+
+
+def test_min_pool_size_defaults_to_zero(monkeypatch):
+    monkeypatch.delenv("MONGO_MIN_POOL_SIZE", raising=False)
+    monkeypatch.setattr(mongo_client, "load_dotenv", lambda: None)
+    _, options = mongo_client._client_options()
+    assert options["minPoolSize"] == 0
+
+
+def test_async_client_is_per_event_loop(monkeypatch):
+    monkeypatch.setattr(mongo_client, "load_dotenv", lambda: None)
+
+    async def clients():
+        first, second = mongo_client.get_async_db(), mongo_client.get_async_db()
+        assert first.client is second.client
+        return first.client
+
+    one = asyncio.run(clients())
+    two = asyncio.run(clients())
+    assert one is not two
+
+    for client in (one, two):
+        asyncio.run(client.close())
@@ -0,0 +1,109 @@
+# tests/test_order_service.py
+# The batched order writer must not lose accepted orders on shutdown.
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("pymongo")
+
+from pymongo.errors import AutoReconnect
+
+from services.business_logic.order_service import api
+
+
+class _Orders:
+    def __init__(self, delay: float = 0.0):
+        self.delay    = delay
+        self.failures = []     # exceptions raised by the next bulk_writes
+        self.written  = []
+        self._lock    = threading.Lock()
+
+    def bulk_write(self, ops, ordered=True):
+        delay, self.delay = self.delay, 0.0    # only the first write is slow
+        time.sleep(delay)
+        if self.failures:
+            raise self.failures.pop(0)
+        with self._lock:
+            self.written.extend(op._doc for op in ops)
+
+
+class _DB:
+    def __init__(self, delay: float = 0.0):
+        self.orders = _Orders(delay)
+
+    def get_collection(self, name):
+        return getattr(self, name)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = _DB()
+    monkeypatch.setattr(api, "get_db", lambda: fake)
+    return fake
+
+
+def _order(n: int) -> dict:
+    return {"customer_id": f"c{n}", "item": "rice", "quantity": n}
+
+
+def test_shutdown_writes_partial_batch(db, monkeypatch):
+    monkeypatch.setattr(api, "ORDER_FLUSH_INTERVAL", 60)   # writer is mid-collection
+
+    async def run():
+        await api._start_order_writer()
+        for n in range(3):
+            await api._order_queue.put(_order(n))
+        await asyncio.sleep(0.05)         # the writer has taken them off the queue
+        assert api._order_queue.empty()
+        await api._stop_order_writer()
+
+    asyncio.run(run())
+    assert [o["quantity"] for o in db.orders.written] == [0, 1, 2]
+
+
+def test_shutdown_waits_for_in_flight_insert(db, monkeypatch):
+    db.orders.delay = 0.2
+    monkeypatch.setattr(api, "ORDER_FLUSH_INTERVAL", 0.01)
+
+    async def run():
+        await api._start_order_writer()
+        await api._order_queue.put(_order(1))
+        await asyncio.sleep(0.05)         # insert_many is now running
+        await api._order_queue.put(_order(2))
+        await api._stop_order_writer()
+        # Both landed by the time shutdown returns, not just eventually
+        assert sorted(o["quantity"] for o in db.orders.written) == [1, 2]
+
+    asyncio.run(run())
+
+
+def test_transient_failure_is_retried_not_dropped(db, monkeypatch):
+    db.orders.failures = [AutoReconnect("primary stepped down")]
+    monkeypatch.setattr(api, "ORDER_FLUSH_INTERVAL", 0.01)
+
+    async def run():
+        await api._start_order_writer()
+        await api._order_queue.put(_order(1))
+        await api._stop_order_writer()
+
+    asyncio.run(run())
+    assert [o["quantity"] for o in db.orders.written] == [1]
+
+
+def test_shutdown_flush_failure_is_logged_not_raised(db, monkeypatch):
+    db.orders.failures = [AutoReconnect("down")] * 3
+    monkeypatch.setattr(api, "ORDER_FLUSH_INTERVAL", 60)
+
+    async def run():
+        await api._start_order_writer()
+        api._writer_task.cancel()
+        await asyncio.gather(api._writer_task, return_exceptions=True)
+        await api._order_queue.put(_order(1))    # left for the shutdown flush
+        await api._stop_order_writer()
+
+    asyncio.run(run())
+    assert db.orders.written == []
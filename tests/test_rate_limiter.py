@@ -0,0 +1,47 @@
+# tests/test_rate_limiter.py
+# Token bucket: burst, refill, cap, and the blocking acquire.
+
+import pytest
+
+from shared.utils import rate_limiter
+from shared.utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_then_limited(clock):
+    limiter = RateLimiter("test", max_tokens=3, refill_rate=1.0)
+    assert [limiter.acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_refills_at_rate_and_caps_at_max(clock):
+    limiter = RateLimiter("test", max_tokens=2, refill_rate=0.5)
+    assert limiter.acquire(2)
+
+    clock[0] += 1                       # 0.5 tokens
+    assert not limiter.acquire()
+    clock[0] += 1                       # 1.0
+    assert limiter.acquire()
+
+    clock[0] += 100                     # capped at max_tokens
+    assert limiter.acquire(2)
+    assert not limiter.acquire()
+
+
+def test_stale_clock_read_never_removes_tokens(clock):
+    limiter = RateLimiter("test", max_tokens=2, refill_rate=1.0)
+    limiter.acquire()
+    limiter._refill(clock[0] - 5)       # read before another thread refilled
+    assert limiter._tokens == 1.0
+
+
+def test_wait_and_acquire_sleeps_until_refilled():
+    limiter = RateLimiter("test", max_tokens=1, refill_rate=20.0)
+    assert limiter.acquire()
+    assert limiter.wait_and_acquire(timeout=1.0)      # ~50ms refill
+    assert not limiter.wait_and_acquire(timeout=0.0)
@@ -0,0 +1,20 @@
+# tests/test_sarvam_stt.py
+# The pooled httpx client is never shared across event loops.
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from stt import sarvam_stt
+
+
+def test_client_is_per_event_loop():
+    async def client_pair():
+        return sarvam_stt._get_client(), sarvam_stt._get_client()
+
+    first, same = asyncio.run(client_pair())
+    second, _   = asyncio.run(client_pair())
+    assert first is same
+    assert first is not second
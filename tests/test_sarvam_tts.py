@@ -0,0 +1,71 @@
+# tests/test_sarvam_tts.py
+# Phrase cache: entries match what the controller speaks, and prewarm runs
+# under any event loop.
+
+import asyncio
+import base64
+import re
+from types import SimpleNamespace
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+import orjson
+
+from action_executor import execute
+from conversation_state import ConversationState
+from tts import sarvam_tts
+from tts.sarvam_tts import CACHEABLE_PHRASES, SarvamTTS
+
+# Same split as conversation_controller._SENTENCE_END (which needs livekit)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def test_every_cached_phrase_is_one_spoken_sentence():
+    for phrase in CACHEABLE_PHRASES:
+        assert _SENTENCE_END.split(phrase) == [phrase]
+
+
+def test_confirm_order_prompt_splits_into_a_cached_phrase():
+    state = ConversationState(session_id="s1")
+    state.items_by_name["rice"] = {"name": "rice", "quantity": 2, "unit": "kg"}
+    intent = SimpleNamespace(intent="confirm_order", raw_text="confirm", llm_used=False)
+    reply  = asyncio.run(execute(intent, state))
+
+    sentences = _SENTENCE_END.split(reply.strip())
+    assert sentences[-1] == "Say yes to confirm or no to cancel."
+    assert sentences[-1] in CACHEABLE_PHRASES
+
+
+@pytest.fixture
+def tts(monkeypatch, tmp_path):
+    monkeypatch.setattr(sarvam_tts, "SARVAM_API_KEY", "test")
+    monkeypatch.setattr(sarvam_tts, "TTS_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(sarvam_tts, "_PCM_CACHE", {})
+    monkeypatch.setattr(sarvam_tts, "wav_to_pcm", lambda wav, rate: b"pcm")
+
+    # Real synthesize/_call_api path; only the network is replaced
+    body      = orjson.dumps({"audios": [base64.b64encode(b"wav").decode()]})
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body))
+    real      = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kw: real(transport=transport, **kw))
+    monkeypatch.setattr(sarvam_tts, "_clients", type(sarvam_tts._clients)())
+    return SarvamTTS()
+
+
+def test_prewarm_runs_under_separate_event_loops(tts):
+    clients = []
+
+    async def prewarm():
+        await tts.prewarm(16000)
+        clients.append(sarvam_tts._get_client())
+
+    asyncio.run(prewarm())
+    sarvam_tts._PCM_CACHE.clear()
+    (sarvam_tts.TTS_CACHE_DIR / "tts_pcm_16000.json").unlink()
+    asyncio.run(prewarm())               # synthesizes again, on a new loop
+
+    assert tts.get_pcm("Hello!", 16000) == b"pcm"
+    assert (sarvam_tts.TTS_CACHE_DIR / "tts_pcm_16000.json").exists()
+    assert clients[0] is not clients[1]
+